@@ -11,7 +11,8 @@ import re
 import unicodedata
 import zipfile
 from collections import defaultdict
-from copy import deepcopy
+from copy import copy, deepcopy
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from xml.etree import ElementTree as ET
@@ -72,7 +73,8 @@ COMPANY_BURDEN_MULTIPLIER = {
 }
 
 def normalize_spaces(value: str) -> str:
-    return " ".join((value or "").strip().split())
+    # split() with no separator already drops leading/trailing whitespace.
+    return " ".join((value or "").split())
 
 
 def normalize_company(company: str) -> str | None:
@@ -103,13 +105,17 @@ def parse_home_company_label(value: str) -> str | None:
     return None
 
 
+# Lowercases ASCII letters and turns every other non-alphanumeric ASCII character into a space, in one C pass.
+NAME_KEY_TABLE = str.maketrans(
+    {chr(code): (chr(code).lower() if chr(code).isalnum() else " ") for code in range(128)}
+)
+
+
 def normalize_name(name: str) -> str:
-    text = unicodedata.normalize("NFKD", name or "")
-    text = text.encode("ascii", "ignore").decode("ascii")
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9 ]+", " ", text)
-    tokens = [token for token in text.split() if token]
-    return " ".join(tokens)
+    text = name or ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return " ".join(text.translate(NAME_KEY_TABLE).split())
 
 
 def name_first_last(normalized_name: str) -> tuple[str, str]:
@@ -376,7 +382,11 @@ def clone_template_row(sheet_data: ET.Element, template_row: ET.Element, target_
 
 
 def get_shared_strings(zf: zipfile.ZipFile) -> list[str]:
-    root = ET.fromstring(zf.read("xl/sharedStrings.xml"))
+    return parse_shared_strings(zf.read("xl/sharedStrings.xml"))
+
+
+def parse_shared_strings(xml_bytes: bytes) -> list[str]:
+    root = ET.fromstring(xml_bytes)
     strings: list[str] = []
     for item in root.findall("a:si", NS):
         text = "".join(node.text or "" for node in item.findall(".//a:t", NS))
@@ -953,10 +963,21 @@ def match_names(
     normalized_to_workbook: dict[str, list[str]] = defaultdict(list)
     first_last_to_workbook: dict[tuple[str, str], list[str]] = defaultdict(list)
 
+    # Normalize each workbook name once; the fuzzy fallback below reuses these for every source name.
+    workbook_keys: list[tuple[str, str, str, str]] = []
     for workbook_name in workbook_names:
         normalized = normalize_name(workbook_name)
         normalized_to_workbook[normalized].append(workbook_name)
         first_last_to_workbook[name_first_last(normalized)].append(workbook_name)
+        workbook_tokens = normalized.split()
+        workbook_keys.append(
+            (
+                workbook_name,
+                normalized,
+                workbook_tokens[0] if workbook_tokens else "",
+                workbook_tokens[-1] if workbook_tokens else "",
+            )
+        )
 
     used_workbook_names: set[str] = set()
     source_to_workbook: dict[str, str] = {}
@@ -988,13 +1009,9 @@ def match_names(
                 source_first = source_tokens[0] if source_tokens else ""
 
                 scored: list[tuple[float, str]] = []
-                for workbook_name in workbook_names:
+                for workbook_name, normalized_workbook, workbook_first, workbook_last in workbook_keys:
                     if workbook_name in used_workbook_names:
                         continue
-                    normalized_workbook = normalize_name(workbook_name)
-                    workbook_tokens = normalized_workbook.split()
-                    workbook_first = workbook_tokens[0] if workbook_tokens else ""
-                    workbook_last = workbook_tokens[-1] if workbook_tokens else ""
                     score = difflib.SequenceMatcher(
                         None, normalized_source, normalized_workbook
                     ).ratio()
@@ -1131,6 +1148,20 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+@lru_cache(maxsize=8)
+def read_workbook_members(
+    workbook_path: str, size: int, mtime_ns: int, ctime_ns: int
+) -> tuple[tuple[zipfile.ZipInfo, bytes], ...]:
+    # Keyed on size/mtime/ctime so a replaced template is re-read; callers must not mutate the shared ZipInfo.
+    with zipfile.ZipFile(workbook_path, "r") as zin:
+        return tuple((item, zin.read(item.filename)) for item in zin.infolist())
+
+
+def load_workbook_members(workbook_path: Path) -> tuple[tuple[zipfile.ZipInfo, bytes], ...]:
+    stat = workbook_path.stat()
+    return read_workbook_members(str(workbook_path), stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+
+
 def fill_workbook(
     workbook_path: Path,
     hours_csv_path: Path,
@@ -1155,165 +1186,161 @@ def fill_workbook(
     ) = load_tips_csv(tips_csv_path) if tips_csv_path else ({}, {}, [])
     tip_source_names = list(tip_totals_by_source_name.keys())
 
-    with zipfile.ZipFile(workbook_path, "r") as zin:
-        shared_strings = get_shared_strings(zin)
-        workbook_original_bytes = zin.read("xl/workbook.xml")
-        workbook_root = ET.fromstring(workbook_original_bytes)
-        sheet1_original_bytes = zin.read("xl/worksheets/sheet1.xml")
-        sheet1_root = ET.fromstring(sheet1_original_bytes)
-        workbook_rels_path = "xl/_rels/workbook.xml.rels"
-        workbook_rels_bytes = (
-            zin.read(workbook_rels_path)
-            if workbook_rels_path in zin.namelist()
-            else None
+    members = load_workbook_members(workbook_path)
+    member_bytes = {item.filename: data for item, data in members}
+    shared_strings = parse_shared_strings(member_bytes["xl/sharedStrings.xml"])
+    workbook_original_bytes = member_bytes["xl/workbook.xml"]
+    workbook_root = ET.fromstring(workbook_original_bytes)
+    sheet1_original_bytes = member_bytes["xl/worksheets/sheet1.xml"]
+    sheet1_root = ET.fromstring(sheet1_original_bytes)
+    workbook_rels_path = "xl/_rels/workbook.xml.rels"
+    workbook_rels_bytes = member_bytes.get(workbook_rels_path)
+
+    sheet_data = sheet1_root.find("a:sheetData", NS)
+    if sheet_data is None:
+        raise ValueError("Could not find sheetData in xl/worksheets/sheet1.xml")
+
+    reimbursement_row = 101
+    if roster_path:
+        roster_entries = load_roster(roster_path)
+        employee_rows, reimbursement_row = build_employee_rows_from_roster(
+            sheet1_root, sheet_data, roster_entries
         )
+    else:
+        employee_rows = []
+        current_home_company: str | None = None
+        for row_elem in sheet_data.findall("a:row", NS):
+            row_number = int(row_elem.attrib["r"])
+            cell_map = get_row_cells(row_elem)
+
+            section_label = get_string_cell_value(cell_map.get("B"), shared_strings)
+            if section_label:
+                parsed_home_company = parse_home_company_label(section_label)
+                if parsed_home_company:
+                    current_home_company = parsed_home_company
+                elif normalize_name(section_label) == "total":
+                    current_home_company = None
+
+            workbook_name = get_string_cell_value(cell_map.get("B"), shared_strings)
+            rate = get_numeric_cell_value(cell_map.get("C"))
+            if workbook_name and rate is not None and current_home_company:
+                employee_rows.append(
+                    {
+                        "row_number": row_number,
+                        "row_elem": row_elem,
+                        "workbook_name": workbook_name,
+                        "home_company": current_home_company,
+                    }
+                )
 
-        sheet_data = sheet1_root.find("a:sheetData", NS)
-        if sheet_data is None:
-            raise ValueError("Could not find sheetData in xl/worksheets/sheet1.xml")
+    workbook_names = [entry["workbook_name"] for entry in employee_rows]
+    source_to_workbook, unmatched_sources = match_names(workbook_names, source_names)
+    workbook_to_source = {workbook: source for source, workbook in source_to_workbook.items()}
+    tip_source_to_workbook, unmatched_tip_sources = match_names(
+        workbook_names, tip_source_names
+    )
+    workbook_to_tip_source = {
+        workbook: source for source, workbook in tip_source_to_workbook.items()
+    }
 
-        reimbursement_row = 101
-        if roster_path:
-            roster_entries = load_roster(roster_path)
-            employee_rows, reimbursement_row = build_employee_rows_from_roster(
-                sheet1_root, sheet_data, roster_entries
-            )
-        else:
-            employee_rows = []
-            current_home_company: str | None = None
-            for row_elem in sheet_data.findall("a:row", NS):
-                row_number = int(row_elem.attrib["r"])
-                cell_map = get_row_cells(row_elem)
-
-                section_label = get_string_cell_value(cell_map.get("B"), shared_strings)
-                if section_label:
-                    parsed_home_company = parse_home_company_label(section_label)
-                    if parsed_home_company:
-                        current_home_company = parsed_home_company
-                    elif normalize_name(section_label) == "total":
-                        current_home_company = None
-
-                workbook_name = get_string_cell_value(cell_map.get("B"), shared_strings)
-                rate = get_numeric_cell_value(cell_map.get("C"))
-                if workbook_name and rate is not None and current_home_company:
-                    employee_rows.append(
-                        {
-                            "row_number": row_number,
-                            "row_elem": row_elem,
-                            "workbook_name": workbook_name,
-                            "home_company": current_home_company,
-                        }
-                    )
-
-        workbook_names = [entry["workbook_name"] for entry in employee_rows]
-        source_to_workbook, unmatched_sources = match_names(workbook_names, source_names)
-        workbook_to_source = {workbook: source for source, workbook in source_to_workbook.items()}
-        tip_source_to_workbook, unmatched_tip_sources = match_names(
-            workbook_names, tip_source_names
-        )
-        workbook_to_tip_source = {
-            workbook: source for source, workbook in tip_source_to_workbook.items()
-        }
+    if tip_summary_output_path:
+        canonical_tip_totals: dict[str, float] = defaultdict(float)
+        for source_name, amount in tip_totals_by_source_name.items():
+            mapped_name = tip_source_to_workbook.get(source_name, source_name)
+            canonical_tip_totals[mapped_name] += amount
+        write_tip_summary_csv(tip_summary_output_path, canonical_tip_totals)
 
-        if tip_summary_output_path:
-            canonical_tip_totals: dict[str, float] = defaultdict(float)
-            for source_name, amount in tip_totals_by_source_name.items():
-                mapped_name = tip_source_to_workbook.get(source_name, source_name)
-                canonical_tip_totals[mapped_name] += amount
-            write_tip_summary_csv(tip_summary_output_path, canonical_tip_totals)
+    for entry in employee_rows:
+        workbook_name = entry["workbook_name"]
+        row_number = entry["row_number"]
+        row_elem = entry["row_elem"]
 
-        for entry in employee_rows:
-            workbook_name = entry["workbook_name"]
-            row_number = entry["row_number"]
-            row_elem = entry["row_elem"]
+        source_name = workbook_to_source.get(workbook_name)
+        buckets = hours_by_source_name.get(source_name, {}) if source_name else {}
 
-            source_name = workbook_to_source.get(workbook_name)
-            buckets = hours_by_source_name.get(source_name, {}) if source_name else {}
+        set_numeric_cell(
+            row_elem, row_number, COMPANY_TO_COLUMN["scanio"], buckets.get("scanio", 0.0)
+        )
+        set_numeric_cell(
+            row_elem,
+            row_number,
+            COMPANY_TO_COLUMN["sea_and_air"],
+            buckets.get("sea_and_air", 0.0),
+        )
+        set_numeric_cell(
+            row_elem,
+            row_number,
+            COMPANY_TO_COLUMN["flat_price"],
+            buckets.get("flat_price", 0.0),
+        )
 
-            set_numeric_cell(
-                row_elem, row_number, COMPANY_TO_COLUMN["scanio"], buckets.get("scanio", 0.0)
-            )
-            set_numeric_cell(
-                row_elem,
-                row_number,
-                COMPANY_TO_COLUMN["sea_and_air"],
-                buckets.get("sea_and_air", 0.0),
+        if tip_totals_by_source_name:
+            tip_source_name = workbook_to_tip_source.get(workbook_name)
+            tip_total = (
+                tip_totals_by_source_name.get(tip_source_name, 0.0)
+                if tip_source_name
+                else 0.0
             )
-            set_numeric_cell(
-                row_elem,
-                row_number,
-                COMPANY_TO_COLUMN["flat_price"],
-                buckets.get("flat_price", 0.0),
+            tip_breakdown = (
+                dict(tip_source_breakdown_by_source_name.get(tip_source_name, {}))
+                if tip_source_name
+                else {}
             )
 
-            if tip_totals_by_source_name:
-                tip_source_name = workbook_to_tip_source.get(workbook_name)
-                tip_total = (
-                    tip_totals_by_source_name.get(tip_source_name, 0.0)
-                    if tip_source_name
-                    else 0.0
+            assigned_amount = sum(tip_breakdown.values())
+            remainder = tip_total - assigned_amount
+            if abs(remainder) > 1e-9:
+                fallback_source = pick_fallback_tip_source(
+                    tip_breakdown, entry["home_company"]
                 )
-                tip_breakdown = (
-                    dict(tip_source_breakdown_by_source_name.get(tip_source_name, {}))
-                    if tip_source_name
-                    else {}
+                tip_breakdown[fallback_source] = (
+                    tip_breakdown.get(fallback_source, 0.0) + remainder
                 )
 
-                assigned_amount = sum(tip_breakdown.values())
-                remainder = tip_total - assigned_amount
-                if abs(remainder) > 1e-9:
-                    fallback_source = pick_fallback_tip_source(
-                        tip_breakdown, entry["home_company"]
-                    )
-                    tip_breakdown[fallback_source] = (
-                        tip_breakdown.get(fallback_source, 0.0) + remainder
-                    )
-
-                for source_key, column in TIP_SOURCE_TO_COMMISSION_COLUMN.items():
-                    set_numeric_cell(row_elem, row_number, column, tip_breakdown.get(source_key, 0.0))
-
-                # Keep employee total commission in the existing "comm" column.
-                set_numeric_cell(row_elem, row_number, "G", tip_total, preserve_formula=True)
-
-        # Replace Google Sheets-only formula with Excel-compatible IF formula.
-        due_row = reimbursement_row - 8
-        set_formula_string_cell(
-            sheet_data,
-            reimbursement_row,
-            "B",
-            reimbursement_status_formula(due_row),
-        )
+            for source_key, column in TIP_SOURCE_TO_COMMISSION_COLUMN.items():
+                set_numeric_cell(row_elem, row_number, column, tip_breakdown.get(source_key, 0.0))
+
+            # Keep employee total commission in the existing "comm" column.
+            set_numeric_cell(row_elem, row_number, "G", tip_total, preserve_formula=True)
 
-        # Preserve full line visibility in generated workbook.
-        ensure_all_rows_visible(sheet1_root)
-        ensure_recalc_on_open(workbook_root)
+    # Replace Google Sheets-only formula with Excel-compatible IF formula.
+    due_row = reimbursement_row - 8
+    set_formula_string_cell(
+        sheet_data,
+        reimbursement_row,
+        "B",
+        reimbursement_status_formula(due_row),
+    )
 
-        sheet1_bytes = merge_sheet_data_into_original_xml(sheet1_original_bytes, sheet_data)
-        workbook_bytes = merge_calc_pr_into_original_workbook_xml(
-            workbook_original_bytes, workbook_root
+    # Preserve full line visibility in generated workbook.
+    ensure_all_rows_visible(sheet1_root)
+    ensure_recalc_on_open(workbook_root)
+
+    sheet1_bytes = merge_sheet_data_into_original_xml(sheet1_original_bytes, sheet_data)
+    workbook_bytes = merge_calc_pr_into_original_workbook_xml(
+        workbook_original_bytes, workbook_root
+    )
+    updated_workbook_rels_bytes = workbook_rels_bytes
+    remove_calc_chain_part = False
+    if workbook_rels_bytes is not None:
+        updated_workbook_rels_bytes, remove_calc_chain_part = (
+            remove_calc_chain_relationship(workbook_rels_bytes)
         )
-        updated_workbook_rels_bytes = workbook_rels_bytes
-        remove_calc_chain_part = False
-        if workbook_rels_bytes is not None:
-            updated_workbook_rels_bytes, remove_calc_chain_part = (
-                remove_calc_chain_relationship(workbook_rels_bytes)
-            )
 
-        with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as zout:
-            for item in zin.infolist():
-                if remove_calc_chain_part and item.filename == "xl/calcChain.xml":
-                    continue
-                data = zin.read(item.filename)
-                if item.filename == "xl/worksheets/sheet1.xml":
-                    data = sheet1_bytes
-                elif item.filename == "xl/workbook.xml":
-                    data = workbook_bytes
-                elif (
-                    updated_workbook_rels_bytes is not None
-                    and item.filename == workbook_rels_path
-                ):
-                    data = updated_workbook_rels_bytes
-                zout.writestr(item, data)
+    with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as zout:
+        for item, data in members:
+            if remove_calc_chain_part and item.filename == "xl/calcChain.xml":
+                continue
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = sheet1_bytes
+            elif item.filename == "xl/workbook.xml":
+                data = workbook_bytes
+            elif (
+                updated_workbook_rels_bytes is not None
+                and item.filename == workbook_rels_path
+            ):
+                data = updated_workbook_rels_bytes
+            zout.writestr(copy(item), data)
 
     return {
         "output_path": output_path,
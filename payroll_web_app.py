@@ -3,34 +3,49 @@
 
 from __future__ import annotations
 
-import cgi
+import errno
+import gzip
 import hashlib
 import hmac
+import io
 import json
+import multiprocessing
 import os
+import queue
 import re
 import secrets
 import shutil
+import socket
 import sqlite3
 import tempfile
 import threading
 import time
 import traceback
 from datetime import date, datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from http import HTTPStatus
 from http.cookies import SimpleCookie
+from email.parser import HeaderParser
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
-from urllib.parse import parse_qs, urlparse
+from typing import Any, BinaryIO, Iterator
+from urllib.parse import ParseResult, parse_qs, urlparse
 from xml.etree import ElementTree as ET
 import zipfile
 
 from fill_payroll_workbook_from_hours import fill_workbook, load_tips_csv, match_names
 from simplify_timecard_csv import flatten_timecard, write_flat_csv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 APP_ROOT = Path(__file__).resolve().parent
 
 
@@ -60,6 +75,8 @@ def resolve_data_dir() -> Path:
 
 DATA_DIR = resolve_data_dir()
 USERS_DIR = DATA_DIR / "users"
+# Uploads larger than MULTIPART_SPOOL_SIZE spool here rather than /tmp, which is often RAM-backed tmpfs.
+UPLOAD_SPOOL_DIR = DATA_DIR / "uploads"
 DB_PATH = DATA_DIR / "payroll_web.db"
 WORKSPACE_UI_FILENAME = "payroll_workspace_ui.html"
 
@@ -70,12 +87,17 @@ COMPANY_OPTIONS = [
     ("flat_price", "Flat Price"),
 ]
 
+HOME_COMPANY_BY_LABEL = {label.lower(): key for key, label in COMPANY_OPTIONS}
+COMPANY_LABELS = dict(COMPANY_OPTIONS)
+COMPANY_OPTION_ITEMS = [{"value": key, "label": label} for key, label in COMPANY_OPTIONS]
+
 DEFAULT_BURDEN_BY_COMPANY = {
     "scanio_moving": 1.18,
     "scanio_storage": 1.24,
     "sea_and_air_intl": 1.18,
     "flat_price": 1.18,
 }
+COMPANY_KEYS = frozenset(DEFAULT_BURDEN_BY_COMPANY)
 
 TEMPLATE_COMPANY_ROW_SLOTS = {
     "scanio_moving": list(range(5, 26)),
@@ -105,6 +127,7 @@ BUNDLED_TEMPLATE_CANDIDATE_NAMES = (
 XLSX_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
 XLSX_NS = {"a": XLSX_NS_MAIN}
 CELL_REF_RE = re.compile(r"([A-Z]+)(\d+)")
+BYTE_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
 SESSION_TTL_SECONDS = 60 * 60 * 24 * 7
 SESSION_COOKIE_NAME = os.environ.get("PAYROLL_SESSION_COOKIE_NAME", "payroll_session").strip() or "payroll_session"
 SESSION_COOKIE_SAMESITE = os.environ.get("PAYROLL_COOKIE_SAMESITE", "Lax").strip().title() or "Lax"
@@ -113,10 +136,48 @@ if SESSION_COOKIE_SAMESITE not in {"Lax", "Strict", "None"}:
 SESSION_COOKIE_SECURE = env_bool("PAYROLL_COOKIE_SECURE", False) or SESSION_COOKIE_SAMESITE == "None"
 SESSION_TTL_SECONDS = env_int("PAYROLL_SESSION_TTL_SECONDS", SESSION_TTL_SECONDS)
 ALLOW_SELF_REGISTRATION = env_bool("PAYROLL_ALLOW_REGISTRATION", True)
+JOB_WORKERS = max(1, env_int("PAYROLL_JOB_WORKERS", os.cpu_count() or 4))
+JOB_STREAM_RECHECK_SECONDS = max(1, env_int("PAYROLL_JOB_STREAM_RECHECK_SECONDS", 15))
+JOB_STREAM_MAX_SECONDS = 300
+WORKSPACE_BULK_MAX_WEEKS = 100
+HTTP_THREAD_IDLE_SECONDS = 60
+HASH_WORKERS = max(1, env_int("PAYROLL_HASH_WORKERS", max(2, (os.cpu_count() or 4) // 2)))
+
+
+def new_job_executor() -> ProcessPoolExecutor:
+    # Workbook fills are CPU-bound Python, so run them in worker processes instead of GIL-bound threads.
+    # "spawn" avoids forking the threaded HTTP server.
+    return ProcessPoolExecutor(max_workers=JOB_WORKERS, mp_context=multiprocessing.get_context("spawn"))
 
-JOB_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="payroll-agent")
+
+JOB_EXECUTOR = new_job_executor()
+# pbkdf2_hmac releases the GIL, so threads hash in parallel; the pool caps how many cores a login burst can take.
+HASH_EXECUTOR = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="payroll-hash")
+# The first submit to a fresh (or replaced) spawn pool starts the worker processes; do that off the request thread.
+JOB_SUBMIT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="payroll-job-submit")
 JOB_FUTURES: dict[str, Any] = {}
 JOB_FUTURES_LOCK = threading.Lock()
+JOB_CHANGED = threading.Condition()
+JOB_CHANGE_SEQ = 0
+
+DB_POOL_SIZE = max(4, JOB_WORKERS)
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+DB_POOL: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+SESSION_SWEEP_INTERVAL_SECONDS = 60
+SESSION_SWEEP_LOCK = threading.Lock()
+LAST_SESSION_SWEEP = 0
+SESSION_CACHE_TTL_SECONDS = 60
+SESSION_CACHE_MAX_ENTRIES = 4096
+SESSION_CACHE: OrderedDict[str, tuple[AuthUser, float]] = OrderedDict()
+SESSION_CACHE_LOCK = threading.Lock()
+# Set by init_storage when payroll_weeks still carries the pre-migration payload_json column.
+WEEK_PAYLOAD_INLINE = False
 
 
 @dataclass
@@ -129,8 +190,26 @@ def now_ts() -> int:
     return int(time.time())
 
 
+# Unix seconds computed by SQLite itself; unixepoch() would need SQLite 3.38+.
+SQL_NOW = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+
 def normalize_spaces(value: str) -> str:
-    return " ".join((value or "").strip().split())
+    # split() with no separator already drops leading/trailing whitespace.
+    return " ".join((value or "").split())
+
+
+def json_dumps_bytes(payload: Any) -> bytes:
+    if orjson is not None:
+        # OPT_NON_STR_KEYS keeps json.dumps' behaviour of stringifying int/float dict keys.
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(raw: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def parse_iso_date(value: str) -> date | None:
@@ -190,15 +269,49 @@ def user_dir(user_id: int) -> Path:
     return path
 
 
-def db_conn() -> sqlite3.Connection:
-    con = sqlite3.connect(DB_PATH)
+def open_db_connection() -> sqlite3.Connection:
+    con = sqlite3.connect(DB_PATH, check_same_thread=False)
     con.row_factory = sqlite3.Row
+    for pragma in DB_PRAGMAS:
+        con.execute(pragma)
     return con
 
 
+@contextmanager
+def db_conn(outer: sqlite3.Connection | None = None) -> Iterator[sqlite3.Connection]:
+    # Hand out a warm pooled connection; commit on success, roll back on error, then return it to the pool.
+    # Passing an already-open connection joins the caller's transaction instead.
+    if outer is not None:
+        yield outer
+        return
+    try:
+        con = DB_POOL.get_nowait()
+    except queue.Empty:
+        con = open_db_connection()
+    try:
+        with con:
+            yield con
+    finally:
+        try:
+            DB_POOL.put_nowait(con)
+        except queue.Full:
+            con.close()
+
+
+def warm_db_pool() -> None:
+    while True:
+        con = open_db_connection()
+        try:
+            DB_POOL.put_nowait(con)
+        except queue.Full:
+            con.close()
+            return
+
+
 def init_storage() -> None:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     USERS_DIR.mkdir(parents=True, exist_ok=True)
+    UPLOAD_SPOOL_DIR.mkdir(parents=True, exist_ok=True)
     with db_conn() as con:
         con.executescript(
             """
@@ -229,6 +342,22 @@ def init_storage() -> None:
                 UNIQUE(user_id, name COLLATE NOCASE),
                 FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
             );
+            CREATE TABLE IF NOT EXISTS employee_revisions (
+                user_id INTEGER PRIMARY KEY,
+                revision INTEGER NOT NULL
+            );
+            CREATE TRIGGER IF NOT EXISTS employees_revision_insert AFTER INSERT ON employees BEGIN
+                INSERT INTO employee_revisions(user_id, revision) VALUES(NEW.user_id, 1)
+                ON CONFLICT(user_id) DO UPDATE SET revision = revision + 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS employees_revision_update AFTER UPDATE ON employees BEGIN
+                INSERT INTO employee_revisions(user_id, revision) VALUES(NEW.user_id, 1)
+                ON CONFLICT(user_id) DO UPDATE SET revision = revision + 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS employees_revision_delete AFTER DELETE ON employees BEGIN
+                INSERT INTO employee_revisions(user_id, revision) VALUES(OLD.user_id, 1)
+                ON CONFLICT(user_id) DO UPDATE SET revision = revision + 1;
+            END;
             CREATE TABLE IF NOT EXISTS settings (
                 user_id INTEGER PRIMARY KEY,
                 default_template_path TEXT,
@@ -244,9 +373,14 @@ def init_storage() -> None:
                 error_text TEXT,
                 output_path TEXT,
                 output_filename TEXT,
-                log_text TEXT,
                 FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
             );
+            CREATE INDEX IF NOT EXISTS idx_jobs_user_created ON jobs(user_id, created_at DESC);
+            CREATE TABLE IF NOT EXISTS job_logs (
+                job_id TEXT PRIMARY KEY,
+                log_text TEXT,
+                FOREIGN KEY(job_id) REFERENCES jobs(id) ON DELETE CASCADE
+            );
             CREATE TABLE IF NOT EXISTS payroll_weeks (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER NOT NULL,
@@ -254,17 +388,54 @@ def init_storage() -> None:
                 week_end TEXT NOT NULL,
                 pay_period TEXT NOT NULL,
                 period_note TEXT,
-                payload_json TEXT NOT NULL,
                 created_at INTEGER NOT NULL,
                 updated_at INTEGER NOT NULL,
                 UNIQUE(user_id, week_start),
                 FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
             );
+            CREATE INDEX IF NOT EXISTS idx_payroll_weeks_updated ON payroll_weeks(updated_at, id);
+            CREATE INDEX IF NOT EXISTS idx_payroll_weeks_week ON payroll_weeks(week_start, week_end, updated_at, id);
+            CREATE TABLE IF NOT EXISTS payroll_week_payloads (
+                week_id INTEGER PRIMARY KEY,
+                payload_json TEXT NOT NULL,
+                FOREIGN KEY(week_id) REFERENCES payroll_weeks(id) ON DELETE CASCADE
+            );
             """
         )
         employee_cols = {str(row["name"]) for row in con.execute("PRAGMA table_info(employees)").fetchall()}
         if "is_hidden" not in employee_cols:
             con.execute("ALTER TABLE employees ADD COLUMN is_hidden INTEGER NOT NULL DEFAULT 0")
+        migrate_blob_columns(con)
+
+
+def migrate_blob_columns(con: sqlite3.Connection) -> None:
+    # Older databases kept log_text/payload_json inline on jobs/payroll_weeks; move them to side tables
+    # so status polling and week listings never page in the large text columns. The emptied columns stay so
+    # an older build can still open the database, and anything it wrote there is picked up on the next start.
+    global WEEK_PAYLOAD_INLINE
+    job_cols = {str(row["name"]) for row in con.execute("PRAGMA table_info(jobs)").fetchall()}
+    if "log_text" in job_cols:
+        con.execute(
+            """
+            INSERT INTO job_logs(job_id, log_text)
+            SELECT id, log_text FROM jobs WHERE log_text IS NOT NULL
+            ON CONFLICT(job_id) DO UPDATE SET log_text = excluded.log_text
+            """
+        )
+        con.execute("UPDATE jobs SET log_text = NULL WHERE log_text IS NOT NULL")
+    week_cols = {str(row["name"]) for row in con.execute("PRAGMA table_info(payroll_weeks)").fetchall()}
+    WEEK_PAYLOAD_INLINE = "payload_json" in week_cols
+    if WEEK_PAYLOAD_INLINE:
+        con.execute(
+            """
+            INSERT INTO payroll_week_payloads(week_id, payload_json)
+            SELECT id, payload_json FROM payroll_weeks WHERE true
+            ON CONFLICT(week_id) DO UPDATE SET payload_json = excluded.payload_json
+            WHERE excluded.payload_json != '{}'
+            """
+        )
+        # The legacy column is NOT NULL, so "{}" stands in for an emptied payload.
+        con.execute("UPDATE payroll_weeks SET payload_json = '{}' WHERE payload_json != '{}'")
 
 
 def create_session(user_id: int) -> str:
@@ -279,6 +450,13 @@ def create_session(user_id: int) -> str:
 
 
 def clear_expired_sessions() -> None:
+    # Housekeeping only (lookups already filter on expires_at), so sweep at most once a minute.
+    global LAST_SESSION_SWEEP
+    now = now_ts()
+    with SESSION_SWEEP_LOCK:
+        if now - LAST_SESSION_SWEEP < SESSION_SWEEP_INTERVAL_SECONDS:
+            return
+        LAST_SESSION_SWEEP = now
     with db_conn() as con:
         con.execute("DELETE FROM sessions WHERE expires_at < ?", (now_ts(),))
 
@@ -292,10 +470,15 @@ def auth_user_from_handler(handler: BaseHTTPRequestHandler) -> AuthUser | None:
     if morsel is None:
         return None
     token = morsel.value
+    with SESSION_CACHE_LOCK:
+        cached = SESSION_CACHE.get(token)
+        if cached is not None and cached[1] > time.monotonic():
+            SESSION_CACHE.move_to_end(token)
+            return cached[0]
     with db_conn() as con:
         row = con.execute(
             """
-            SELECT u.id AS user_id, u.email
+            SELECT u.id AS user_id, u.email, s.expires_at
             FROM sessions s
             JOIN users u ON u.id = s.user_id
             WHERE s.token = ? AND s.expires_at >= ?
@@ -303,8 +486,22 @@ def auth_user_from_handler(handler: BaseHTTPRequestHandler) -> AuthUser | None:
             (token, now_ts()),
         ).fetchone()
     if row is None:
+        forget_session(token)
         return None
-    return AuthUser(user_id=int(row["user_id"]), email=str(row["email"]))
+    user = AuthUser(user_id=int(row["user_id"]), email=str(row["email"]))
+    # Never cache a session past its own expiry.
+    ttl = min(SESSION_CACHE_TTL_SECONDS, int(row["expires_at"]) - now_ts())
+    with SESSION_CACHE_LOCK:
+        SESSION_CACHE[token] = (user, time.monotonic() + ttl)
+        SESSION_CACHE.move_to_end(token)
+        while len(SESSION_CACHE) > SESSION_CACHE_MAX_ENTRIES:
+            SESSION_CACHE.popitem(last=False)
+    return user
+
+
+def forget_session(token: str) -> None:
+    with SESSION_CACHE_LOCK:
+        SESSION_CACHE.pop(token, None)
 
 
 def set_session_cookie(handler: BaseHTTPRequestHandler, token: str) -> None:
@@ -332,7 +529,7 @@ def clear_session_cookie(handler: BaseHTTPRequestHandler) -> None:
 
 
 def json_response(handler: BaseHTTPRequestHandler, payload: dict[str, Any], status: int = 200) -> None:
-    body = json.dumps(payload).encode("utf-8")
+    body = json_dumps_bytes(payload)
     handler.send_response(status)
     handler.send_header("Content-Type", "application/json; charset=utf-8")
     handler.send_header("Content-Length", str(len(body)))
@@ -340,33 +537,146 @@ def json_response(handler: BaseHTTPRequestHandler, payload: dict[str, Any], stat
     handler.wfile.write(body)
 
 
-def text_response(handler: BaseHTTPRequestHandler, text: str, status: int = 200) -> None:
-    body = text.encode("utf-8")
-    handler.send_response(status)
-    handler.send_header("Content-Type", "text/plain; charset=utf-8")
+def etag_json_response(handler: BaseHTTPRequestHandler, payload: dict[str, Any]) -> None:
+    # For polled list endpoints: reply 304 with no body when the client already holds this exact payload.
+    body = json_dumps_bytes(payload)
+    etag_body_response(handler, body, '"' + hashlib.sha1(body).hexdigest() + '"')
+
+
+def etag_body_response(handler: BaseHTTPRequestHandler, body: bytes, etag: str) -> None:
+    if handler.headers.get("If-None-Match", "") == etag:
+        handler.send_response(304)
+        handler.send_header("ETag", etag)
+        handler.send_header("Cache-Control", "no-cache")
+        handler.end_headers()
+        return
+    handler.send_response(200)
+    handler.send_header("Content-Type", "application/json; charset=utf-8")
     handler.send_header("Content-Length", str(len(body)))
+    handler.send_header("ETag", etag)
+    handler.send_header("Cache-Control", "no-cache")
     handler.end_headers()
     handler.wfile.write(body)
 
 
-def html_response(handler: BaseHTTPRequestHandler, html: str, status: int = 200) -> None:
-    body = html.encode("utf-8")
+def text_response(handler: BaseHTTPRequestHandler, text: str, status: int = 200) -> None:
+    body = text.encode("utf-8")
     handler.send_response(status)
-    handler.send_header("Content-Type", "text/html; charset=utf-8")
+    handler.send_header("Content-Type", "text/plain; charset=utf-8")
     handler.send_header("Content-Length", str(len(body)))
     handler.end_headers()
     handler.wfile.write(body)
 
 
-def file_response(handler: BaseHTTPRequestHandler, data: bytes, filename: str, content_type: str) -> None:
+def page_response(handler: BaseHTTPRequestHandler, page: tuple[bytes, bytes, str]) -> None:
+    body, gzipped, etag = page
+    if handler.headers.get("If-None-Match", "") == etag:
+        handler.send_response(304)
+        handler.send_header("ETag", etag)
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Vary", "Accept-Encoding")
+        handler.end_headers()
+        return
+    use_gzip = "gzip" in handler.headers.get("Accept-Encoding", "").lower()
+    data = gzipped if use_gzip else body
     handler.send_response(200)
-    handler.send_header("Content-Type", content_type)
-    handler.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+    handler.send_header("Content-Type", "text/html; charset=utf-8")
+    if use_gzip:
+        handler.send_header("Content-Encoding", "gzip")
     handler.send_header("Content-Length", str(len(data)))
+    handler.send_header("ETag", etag)
+    handler.send_header("Cache-Control", "no-cache")
+    handler.send_header("Vary", "Accept-Encoding")
     handler.end_headers()
     handler.wfile.write(data)
 
 
+def job_stream_response(handler: BaseHTTPRequestHandler, user_id: int, limit: int) -> None:
+    # Server-sent events: push the job list when this process submits or finishes a job. Status changes made
+    # inside worker processes (queued -> running) are picked up by the periodic recheck.
+    handler.send_response(200)
+    handler.send_header("Content-Type", "text/event-stream; charset=utf-8")
+    handler.send_header("Cache-Control", "no-cache")
+    handler.send_header("X-Accel-Buffering", "no")
+    handler.send_header("Connection", "close")
+    handler.end_headers()
+    deadline = time.monotonic() + JOB_STREAM_MAX_SECONDS
+    with JOB_CHANGED:
+        seen = JOB_CHANGE_SEQ
+    last_body = b""
+    try:
+        while True:
+            body = json_dumps_bytes({"ok": True, "jobs": list_jobs(user_id, limit=limit)})
+            if body != last_body:
+                handler.wfile.write(b"data: " + body + b"\n\n")
+                last_body = body
+            else:
+                handler.wfile.write(b": keepalive\n\n")
+            handler.wfile.flush()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            with JOB_CHANGED:
+                JOB_CHANGED.wait_for(
+                    lambda: JOB_CHANGE_SEQ != seen, timeout=min(remaining, JOB_STREAM_RECHECK_SECONDS)
+                )
+                seen = JOB_CHANGE_SEQ
+    except (BrokenPipeError, ConnectionResetError):
+        return
+
+
+def job_list_limit(parsed: ParseResult) -> int:
+    query = parse_qs(parsed.query)
+    try:
+        return max(1, min(100, int((query.get("limit") or ["30"])[0])))
+    except Exception:
+        return 30
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    match = BYTE_RANGE_RE.match((header or "").strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    start_text, end_text = match.groups()
+    if not start_text:
+        if not end_text or int(end_text) == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(0, size - int(end_text)), size - 1
+    start = int(start_text)
+    if end_text and int(end_text) < start:
+        # A last-byte-pos before first-byte-pos makes the header invalid; RFC 7233 says to ignore it.
+        return None
+    if start >= size:
+        raise ValueError("Unsatisfiable range")
+    return start, min(int(end_text), size - 1) if end_text else size - 1
+
+
+def file_path_response(handler: BaseHTTPRequestHandler, path: Path, filename: str, content_type: str) -> None:
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        try:
+            byte_range = parse_byte_range(handler.headers.get("Range"), size)
+        except ValueError:
+            handler.send_response(416)
+            handler.send_header("Content-Range", f"bytes */{size}")
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+        start, end = byte_range or (0, size - 1)
+        handler.send_response(206 if byte_range else 200)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        handler.send_header("Accept-Ranges", "bytes")
+        if byte_range:
+            handler.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        handler.send_header("Content-Length", str(end - start + 1))
+        handler.end_headers()
+        handler.wfile.flush()
+        if size:
+            # socket.sendfile uses os.sendfile (page cache straight to the socket) and falls back to send() itself.
+            handler.connection.sendfile(handle, start, end - start + 1)
+
+
 def redirect_response(handler: BaseHTTPRequestHandler, location: str, status: int = 302) -> None:
     handler.send_response(status)
     handler.send_header("Location", location)
@@ -374,37 +684,131 @@ def redirect_response(handler: BaseHTTPRequestHandler, location: str, status: in
     handler.end_headers()
 
 
+class RequestBody:
+    # Stands in for rfile during a POST: reads never run past Content-Length into the next pipelined request,
+    # and `remaining` says how much of the body the handler left unread.
+    def __init__(self, rfile: BinaryIO, length: int) -> None:
+        self.rfile = rfile
+        self.remaining = max(0, length)
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.rfile.read(size) if size else b""
+        self.remaining = self.remaining - len(data) if data else 0
+        return data
+
+
 def parse_json_body(handler: BaseHTTPRequestHandler) -> dict[str, Any]:
     length = int(handler.headers.get("Content-Length", "0"))
     raw = handler.rfile.read(length) if length > 0 else b"{}"
     if not raw:
         return {}
-    return json.loads(raw.decode("utf-8"))
+    return json_loads(raw)
 
 
-def parse_multipart_form(handler: BaseHTTPRequestHandler) -> cgi.FieldStorage:
-    content_type = handler.headers.get("Content-Type", "")
-    return cgi.FieldStorage(
-        fp=handler.rfile,
-        headers=handler.headers,
-        environ={"REQUEST_METHOD": "POST", "CONTENT_TYPE": content_type},
-        keep_blank_values=True,
-    )
+@dataclass
+class MultipartForm:
+    fields: dict[str, str]
+    files: dict[str, tuple[str, BinaryIO]]
+
+    def getfirst(self, name: str, default: str | None = None) -> str | None:
+        return self.fields.get(name, default)
+
+
+MULTIPART_CHUNK_SIZE = 1 << 16
+MULTIPART_SPOOL_SIZE = 1 << 20
+# Unread POST bodies up to this size are discarded after the response so the connection can be reused.
+POST_DRAIN_LIMIT = 1 << 16
+
+
+def parse_multipart_form(handler: BaseHTTPRequestHandler) -> MultipartForm:
+    # Streams the body in fixed-size chunks and scans for the boundary with bytes.find; file parts spool to
+    # temp files. Like cgi.FieldStorage, a non-multipart or truncated body yields whatever parts were complete.
+    form = MultipartForm(fields={}, files={})
+    boundary = handler.headers.get_boundary() if handler.headers.get_content_type() == "multipart/form-data" else None
+    remaining = int(handler.headers.get("Content-Length", "0") or 0)
+    if not boundary or remaining <= 0:
+        return form
+
+    delimiter = b"\r\n--" + boundary.encode("latin-1")
+    header_parser = HeaderParser()
+    buf = b"\r\n"
+    state = "preamble"
+    name = ""
+    filename: str | None = None
+    target: BinaryIO | None = None
+
+    while True:
+        if state == "headers":
+            end = buf.find(b"\r\n\r\n")
+            if end >= 0:
+                # Browsers send raw UTF-8 filenames; BytesHeaderParser would decode them as ASCII and mangle them.
+                headers = header_parser.parsestr(buf[:end].decode("utf-8", "replace"))
+                buf = buf[end + 4 :]
+                name = headers.get_param("name", "", header="content-disposition")
+                filename = headers.get_filename()
+                if filename is None:
+                    target = io.BytesIO()
+                else:
+                    target = tempfile.SpooledTemporaryFile(max_size=MULTIPART_SPOOL_SIZE, dir=UPLOAD_SPOOL_DIR)
+                state = "body"
+                continue
+        else:
+            idx = buf.find(delimiter)
+            if idx >= 0 and len(buf) >= idx + len(delimiter) + 2:
+                if target is not None:
+                    target.write(buf[:idx])
+                    if filename is None:
+                        form.fields.setdefault(name, target.getvalue().decode("utf-8", "replace"))
+                    elif name not in form.files:
+                        target.seek(0)
+                        form.files[name] = (filename, target)
+                    target = None
+                buf = buf[idx:]
+                if buf[len(delimiter) : len(delimiter) + 2] == b"--":
+                    break
+                line_end = buf.find(b"\r\n", len(delimiter))
+                if line_end >= 0:
+                    buf = buf[line_end + 2 :]
+                    state = "headers"
+                    continue
+            elif idx < 0 and len(buf) >= len(delimiter):
+                keep = len(delimiter) - 1
+                if target is not None:
+                    target.write(buf[:-keep])
+                buf = buf[-keep:]
+
+        if remaining <= 0:
+            break
+        chunk = handler.rfile.read(min(MULTIPART_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        buf += chunk
+    return form
+
+
+def get_file_field(form: MultipartForm, field_name: str) -> tuple[str, BinaryIO] | None:
+    # The part is already spooled to a temp file; hand back that handle rather than its bytes.
+    upload = form.files.get(field_name)
+    if upload is None or not upload[0]:
+        return None
+    upload[1].seek(0)
+    return upload
 
 
-def get_file_field(form: cgi.FieldStorage, field_name: str) -> tuple[str, bytes] | None:
-    if field_name not in form:
-        return None
-    field = form[field_name]
-    if isinstance(field, list):
-        field = field[0]
-    filename = getattr(field, "filename", None)
-    if not filename:
-        return None
-    data = field.file.read()
-    if not isinstance(data, (bytes, bytearray)):
-        return None
-    return (filename, bytes(data))
+def save_upload(handle: BinaryIO, target: Path) -> None:
+    # readinto/os.write reuse one buffer and skip the BufferedWriter copy; both drop the GIL in the syscall.
+    buf = bytearray(1 << 20)
+    fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while size := handle.readinto(buf):
+            view = memoryview(buf)[:size]
+            while view:
+                view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 def csv_writer(handle: Any) -> Any:
@@ -426,11 +830,14 @@ def safe_float(value: Any, default: float = 0.0) -> float:
         return default
 
 
-def infer_default_rate(company: str, employees: list[dict[str, Any]]) -> float:
-    company_rates = [float(item["rate"]) for item in employees if item["home_company"] == company]
-    if not company_rates:
-        return 0.0
-    return round(sum(company_rates) / len(company_rates), 2)
+def default_rates_by_company(employees: list[dict[str, Any]]) -> dict[str, float]:
+    sums: dict[str, float] = {}
+    counts: dict[str, int] = {}
+    for item in employees:
+        company = item["home_company"]
+        sums[company] = sums.get(company, 0.0) + float(item["rate"])
+        counts[company] = counts.get(company, 0) + 1
+    return {company: round(total / counts[company], 2) for company, total in sums.items()}
 
 
 def read_shared_strings_from_xlsx(zf: zipfile.ZipFile) -> list[str]:
@@ -542,8 +949,8 @@ def template_employees(template_path: Path | None) -> list[dict[str, Any]]:
         return []
 
 
-def get_default_template_path(user_id: int) -> Path | None:
-    with db_conn() as con:
+def get_default_template_path(user_id: int, outer: sqlite3.Connection | None = None) -> Path | None:
+    with db_conn(outer) as con:
         row = con.execute("SELECT default_template_path FROM settings WHERE user_id = ?", (user_id,)).fetchone()
     if row is None:
         return None
@@ -554,8 +961,8 @@ def get_default_template_path(user_id: int) -> Path | None:
     return path if path.exists() else None
 
 
-def set_default_template_path(user_id: int, template_path: Path) -> None:
-    with db_conn() as con:
+def set_default_template_path(user_id: int, template_path: Path, outer: sqlite3.Connection | None = None) -> None:
+    with db_conn(outer) as con:
         con.execute(
             """
             INSERT INTO settings(user_id, default_template_path, updated_at)
@@ -568,6 +975,29 @@ def set_default_template_path(user_id: int, template_path: Path) -> None:
         )
 
 
+EMPLOYEE_LIST_CACHE: dict[tuple[int, bool], tuple[int, bytes, str]] = {}
+EMPLOYEE_LIST_CACHE_LOCK = threading.Lock()
+
+
+def employee_list_body(user_id: int, include_hidden: bool) -> tuple[bytes, str]:
+    # employee_revisions is bumped by triggers on every employees write (including from job workers), so an
+    # unchanged revision means the cached JSON is still exact. Read it before the rows so a racing write can
+    # only make the cache look older than it is.
+    with db_conn() as con:
+        row = con.execute("SELECT revision FROM employee_revisions WHERE user_id = ?", (user_id,)).fetchone()
+    revision = int(row["revision"]) if row is not None else 0
+    key = (user_id, include_hidden)
+    with EMPLOYEE_LIST_CACHE_LOCK:
+        cached = EMPLOYEE_LIST_CACHE.get(key)
+    if cached is not None and cached[0] == revision:
+        return cached[1], cached[2]
+    body = json_dumps_bytes({"ok": True, "employees": get_employees(user_id, include_hidden=include_hidden)})
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    with EMPLOYEE_LIST_CACHE_LOCK:
+        EMPLOYEE_LIST_CACHE[key] = (revision, body, etag)
+    return body, etag
+
+
 def get_employees(user_id: int, include_hidden: bool = False) -> list[dict[str, Any]]:
     hidden_filter = "" if include_hidden else "AND is_hidden = 0"
     with db_conn() as con:
@@ -596,24 +1026,54 @@ def get_employees(user_id: int, include_hidden: bool = False) -> list[dict[str,
     ]
 
 
-def upsert_employee(user_id: int, name: str, home_company: str, rate: float) -> None:
-    if home_company not in DEFAULT_BURDEN_BY_COMPANY:
-        raise ValueError("Invalid company")
-    burden = DEFAULT_BURDEN_BY_COMPANY[home_company]
+UPSERT_EMPLOYEE_SQL = """
+    INSERT INTO employees(user_id, name, home_company, rate, burden_multiplier, is_hidden, updated_at)
+    VALUES(?,?,?,?,?,?,?)
+    ON CONFLICT(user_id, name) DO UPDATE SET
+        home_company = excluded.home_company,
+        rate = excluded.rate,
+        burden_multiplier = excluded.burden_multiplier,
+        is_hidden = 0,
+        updated_at = excluded.updated_at
+"""
+
+
+def upsert_employees_many(user_id: int, rows: list[tuple[str, str, float]]) -> None:
+    # All rows go through one executemany in one transaction: a single commit however many employees change.
+    ts = now_ts()
+    params: list[tuple[Any, ...]] = []
+    for name, home_company, rate in rows:
+        if home_company not in COMPANY_KEYS:
+            raise ValueError("Invalid company")
+        params.append((user_id, name, home_company, rate, DEFAULT_BURDEN_BY_COMPANY[home_company], 0, ts))
+    if not params:
+        return
     with db_conn() as con:
-        con.execute(
-            """
-            INSERT INTO employees(user_id, name, home_company, rate, burden_multiplier, is_hidden, updated_at)
-            VALUES(?,?,?,?,?,?,?)
-            ON CONFLICT(user_id, name) DO UPDATE SET
-                home_company = excluded.home_company,
-                rate = excluded.rate,
-                burden_multiplier = excluded.burden_multiplier,
-                is_hidden = 0,
-                updated_at = excluded.updated_at
-            """,
-            (user_id, name, home_company, rate, burden, 0, now_ts()),
-        )
+        con.executemany(UPSERT_EMPLOYEE_SQL, params)
+
+
+def clean_employee_updates(updates: list[Any]) -> list[tuple[str, str, float]]:
+    # Validate every row before anything is written, so a bad row rejects the whole request.
+    # A name repeated in one request (case-insensitively, like the table's NOCASE key) keeps its last
+    # values and is written once.
+    rows: dict[str, tuple[str, str, float]] = {}
+    for item in updates:
+        if not isinstance(item, dict):
+            continue
+        name = normalize_spaces(str(item.get("name", "")))
+        home_company = str(item.get("home_company", ""))
+        try:
+            rate = float(item.get("rate"))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid rate for {name}") from None
+        if not name:
+            continue
+        if home_company not in COMPANY_KEYS:
+            raise ValueError(f"Invalid company for {name}")
+        if rate < 0:
+            raise ValueError(f"Rate cannot be negative for {name}")
+        rows[name.lower()] = (name, home_company, rate)
+    return list(rows.values())
 
 
 def remove_employees(user_id: int, names: list[str]) -> int:
@@ -622,13 +1082,12 @@ def remove_employees(user_id: int, names: list[str]) -> int:
         return 0
     placeholders = ",".join(["?"] * len(cleaned))
     with db_conn() as con:
-        before = con.execute("SELECT COUNT(*) FROM employees WHERE user_id = ?", (user_id,)).fetchone()[0]
         con.execute(
             f"DELETE FROM employees WHERE user_id = ? AND lower(name) IN ({placeholders})",
             [user_id, *[name.lower() for name in cleaned]],
         )
-        after = con.execute("SELECT COUNT(*) FROM employees WHERE user_id = ?", (user_id,)).fetchone()[0]
-    return int(before - after)
+        removed = int(con.execute("SELECT changes()").fetchone()[0])
+    return removed
 
 
 def set_employees_hidden(user_id: int, names: list[str], hidden: bool) -> int:
@@ -649,43 +1108,49 @@ def set_employees_hidden(user_id: int, names: list[str], hidden: bool) -> int:
     return changed
 
 
-def upsert_employees_from_workspace_rows(user_id: int, rows: list[Any]) -> dict[str, int]:
+UPSERT_WORKSPACE_EMPLOYEE_SQL = """
+    INSERT INTO employees(user_id, name, home_company, rate, burden_multiplier, is_hidden, updated_at)
+    VALUES(?,?,?,?,?,?,?)
+    ON CONFLICT(user_id, name) DO UPDATE SET
+        home_company = excluded.home_company,
+        rate = excluded.rate,
+        burden_multiplier = excluded.burden_multiplier,
+        is_hidden = excluded.is_hidden,
+        updated_at = excluded.updated_at
+"""
+
+
+def upsert_employees_from_workspace_rows(
+    user_id: int, rows: list[Any], outer: sqlite3.Connection | None = None
+) -> dict[str, int]:
     defaults = workspace_rows_to_employee_defaults(rows, include_hidden=True)
     if not defaults:
         return {"upserted": 0}
-    with db_conn() as con:
-        for row in defaults:
-            home_company = str(row["home_company"])
-            burden = DEFAULT_BURDEN_BY_COMPANY.get(home_company, 1.18)
-            con.execute(
-                """
-                INSERT INTO employees(user_id, name, home_company, rate, burden_multiplier, is_hidden, updated_at)
-                VALUES(?,?,?,?,?,?,?)
-                ON CONFLICT(user_id, name) DO UPDATE SET
-                    home_company = excluded.home_company,
-                    rate = excluded.rate,
-                    burden_multiplier = excluded.burden_multiplier,
-                    is_hidden = excluded.is_hidden,
-                    updated_at = excluded.updated_at
-                """,
-                (
-                    user_id,
-                    str(row["name"]),
-                    home_company,
-                    safe_float(row.get("rate"), 0.0),
-                    burden,
-                    1 if bool(row.get("is_hidden")) else 0,
-                    now_ts(),
-                ),
-            )
+    ts = now_ts()
+    params = [
+        (
+            user_id,
+            str(row["name"]),
+            str(row["home_company"]),
+            safe_float(row.get("rate"), 0.0),
+            DEFAULT_BURDEN_BY_COMPANY.get(str(row["home_company"]), 1.18),
+            1 if bool(row.get("is_hidden")) else 0,
+            ts,
+        )
+        for row in defaults
+    ]
+    with db_conn(outer) as con:
+        con.executemany(UPSERT_WORKSPACE_EMPLOYEE_SQL, params)
     return {"upserted": len(defaults)}
 
 
-def sync_employees_from_template(user_id: int, template_path: Path) -> dict[str, int]:
+def sync_employees_from_template(
+    user_id: int, template_path: Path, outer: sqlite3.Connection | None = None
+) -> dict[str, int]:
     items = template_employees(template_path)
     updated = 0
     added = 0
-    with db_conn() as con:
+    with db_conn(outer) as con:
         for item in items:
             name = normalize_spaces(item["name"])
             if not name:
@@ -733,11 +1198,14 @@ def write_roster_json(path: Path, employees: list[dict[str, Any]]) -> None:
             for entry in employees
         ]
     }
-    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    atomic_write_bytes(path, json_dumps_bytes(payload) + b"\n")
 
 
 def home_company_from_label(label: str) -> str:
     text = normalize_spaces(label).lower()
+    exact = HOME_COMPANY_BY_LABEL.get(text)
+    if exact is not None:
+        return exact
     if "scanio storage" in text:
         return "scanio_storage"
     if "scanio" in text:
@@ -902,20 +1370,85 @@ def write_workspace_tips_csv(path: Path, employees: list[dict[str, Any]]) -> Non
 
 
 def write_workspace_roster_json(path: Path, employees: list[dict[str, Any]]) -> None:
+    burden_by_company = DEFAULT_BURDEN_BY_COMPANY
     payload = {
         "employees": [
             {
                 "name": employee["name"],
                 "home_company": employee["home_company"],
                 "rate": float(employee["rate"]),
-                "burden_multiplier": DEFAULT_BURDEN_BY_COMPANY[employee["home_company"]],
+                "burden_multiplier": burden_by_company[employee["home_company"]],
             }
             for employee in employees
         ]
     }
-    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    path.write_bytes(json_dumps_bytes(payload) + b"\n")
+
+
+def prefetch_file(path: Path) -> None:
+    fadvise = getattr(os, "posix_fadvise", None)
+    if fadvise is None:
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 
 
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    # Readers (fill_workbook, a concurrent request) see either the old file or the new one, never a partial write.
+    # No fsync: the job's inputs are regenerated on rerun, so crash durability is not worth the flush.
+    tmp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def fast_copy_file(src: Path, dst: Path) -> None:
+    # copy_file_range keeps the copy in the kernel (and can reflink on Btrfs/XFS); shutil.copyfile
+    # covers platforms or filesystems without it. Metadata is copied like shutil.copy2.
+    copy_file_range = getattr(os, "copy_file_range", None)
+    copied = False
+    if copy_file_range is not None:
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                remaining = os.fstat(src_fd).st_size
+                while remaining > 0:
+                    sent = copy_file_range(src_fd, dst_fd, remaining)
+                    if sent == 0:
+                        break
+                    remaining -= sent
+                copied = remaining == 0
+            except OSError as exc:
+                if exc.errno not in (errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM):
+                    raise
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+    if not copied:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+@lru_cache(maxsize=1)
 def bundled_template_path() -> Path | None:
     for name in BUNDLED_TEMPLATE_CANDIDATE_NAMES:
         candidate = APP_ROOT / name
@@ -924,8 +1457,8 @@ def bundled_template_path() -> Path | None:
     return None
 
 
-def ensure_user_default_template(user_id: int) -> Path | None:
-    existing = get_default_template_path(user_id)
+def ensure_user_default_template(user_id: int, outer: sqlite3.Connection | None = None) -> Path | None:
+    existing = get_default_template_path(user_id, outer)
     if existing is not None and existing.exists():
         return existing
 
@@ -936,18 +1469,54 @@ def ensure_user_default_template(user_id: int) -> Path | None:
     udir = user_dir(user_id)
     default_copy = udir / "templates" / "default_template.xlsx"
     if not default_copy.exists():
-        shutil.copy2(bundled, default_copy)
-    set_default_template_path(user_id, default_copy)
-    sync_employees_from_template(user_id, default_copy)
+        fast_copy_file(bundled, default_copy)
+    sync_employees_from_template(user_id, default_copy, outer)
+    set_default_template_path(user_id, default_copy, outer)
     return default_copy
 
 
 def ensure_user_employees_seeded(user_id: int) -> None:
-    template = ensure_user_default_template(user_id)
-    if template is None:
-        return
-    if not get_employees(user_id):
-        sync_employees_from_template(user_id, template)
+    # One connection and one commit for the whole first-login bootstrap.
+    with db_conn() as con:
+        template = ensure_user_default_template(user_id, con)
+        if template is None:
+            return
+        has_employees = con.execute(
+            "SELECT 1 FROM employees WHERE user_id = ? AND is_hidden = 0 LIMIT 1", (user_id,)
+        ).fetchone()
+        if has_employees is None:
+            sync_employees_from_template(user_id, template, con)
+
+
+SAVE_PAYROLL_WEEK_SQL = f"""
+    INSERT INTO payroll_weeks(
+        user_id, week_start, week_end, pay_period, period_note, created_at, updated_at
+    ) VALUES(?,?,?,?,?,{SQL_NOW},{SQL_NOW})
+    ON CONFLICT(user_id, week_start) DO UPDATE SET
+        week_end = excluded.week_end,
+        pay_period = excluded.pay_period,
+        period_note = excluded.period_note,
+        updated_at = excluded.updated_at
+    RETURNING id
+"""
+
+# Databases migrated from the inline layout keep their NOT NULL payroll_weeks.payload_json column.
+SAVE_PAYROLL_WEEK_INLINE_SQL = f"""
+    INSERT INTO payroll_weeks(
+        user_id, week_start, week_end, pay_period, period_note, payload_json, created_at, updated_at
+    ) VALUES(?,?,?,?,?,'{{}}',{SQL_NOW},{SQL_NOW})
+    ON CONFLICT(user_id, week_start) DO UPDATE SET
+        week_end = excluded.week_end,
+        pay_period = excluded.pay_period,
+        period_note = excluded.period_note,
+        updated_at = excluded.updated_at
+    RETURNING id
+"""
+
+SAVE_PAYROLL_WEEK_PAYLOAD_SQL = """
+    INSERT INTO payroll_week_payloads(week_id, payload_json) VALUES(?,?)
+    ON CONFLICT(week_id) DO UPDATE SET payload_json = excluded.payload_json
+"""
 
 
 def save_payroll_week(
@@ -957,53 +1526,100 @@ def save_payroll_week(
     pay_period: str,
     period_note: str,
     payload_json: str,
+    outer: sqlite3.Connection | None = None,
 ) -> int:
-    ts = now_ts()
-    with db_conn() as con:
-        con.execute(
-            """
-            INSERT INTO payroll_weeks(
-                user_id, week_start, week_end, pay_period, period_note, payload_json, created_at, updated_at
-            ) VALUES(?,?,?,?,?,?,?,?)
-            ON CONFLICT(user_id, week_start) DO UPDATE SET
-                week_end = excluded.week_end,
-                pay_period = excluded.pay_period,
-                period_note = excluded.period_note,
-                payload_json = excluded.payload_json,
-                updated_at = excluded.updated_at
-            """,
-            (user_id, week_start, week_end, pay_period, period_note, payload_json, ts, ts),
-        )
+    with db_conn(outer) as con:
         row = con.execute(
-            "SELECT id FROM payroll_weeks WHERE user_id = ? AND week_start = ?",
-            (user_id, week_start),
+            SAVE_PAYROLL_WEEK_INLINE_SQL if WEEK_PAYLOAD_INLINE else SAVE_PAYROLL_WEEK_SQL,
+            (user_id, week_start, week_end, pay_period, period_note),
         ).fetchone()
-    return int(row["id"]) if row is not None else 0
+        if row is None:
+            return 0
+        con.execute(SAVE_PAYROLL_WEEK_PAYLOAD_SQL, (int(row["id"]), payload_json))
+    return int(row["id"])
+
+
+def build_workspace_week(data: dict[str, Any]) -> dict[str, Any]:
+    week_start_raw = normalize_spaces(str(data.get("week_start", "")))
+    week_start_date = parse_iso_date(week_start_raw)
+    if week_start_date is None:
+        raise ValueError("week_start must be YYYY-MM-DD")
+
+    week_end_date = week_start_date + timedelta(days=6)
+    week_end_raw = normalize_spaces(str(data.get("week_end", "")))
+    parsed_week_end = parse_iso_date(week_end_raw)
+    if parsed_week_end is not None:
+        week_end_date = parsed_week_end
+
+    pay_period = normalize_spaces(str(data.get("pay_period", "")))
+    if not pay_period:
+        pay_period = f"{format_us_date(week_start_date)} - {format_us_date(week_end_date)}"
+
+    raw_rows = data.get("employees", [])
+    if not isinstance(raw_rows, list):
+        raise ValueError("employees must be a list")
+
+    return {
+        "week_start": week_start_date.isoformat(),
+        "week_end": week_end_date.isoformat(),
+        "pay_period": pay_period,
+        "period_note": str(data.get("period_note", "")).strip(),
+        "employees": raw_rows,
+    }
+
+
+def save_workspace_week(
+    user_id: int, payload: dict[str, Any], outer: sqlite3.Connection | None = None
+) -> dict[str, Any]:
+    payload_json = json_dumps_bytes(payload).decode("utf-8")
+    # Roster upsert and week save share one transaction: one commit, and neither lands without the other.
+    with db_conn(outer) as con:
+        sync_result = upsert_employees_from_workspace_rows(user_id, payload["employees"], con)
+        period_id = save_payroll_week(
+            user_id=user_id,
+            week_start=payload["week_start"],
+            week_end=payload["week_end"],
+            pay_period=payload["pay_period"],
+            period_note=payload["period_note"],
+            payload_json=payload_json,
+            outer=con,
+        )
+    return {
+        "ok": True,
+        "period_id": period_id,
+        "week_start": payload["week_start"],
+        "week_end": payload["week_end"],
+        "pay_period": payload["pay_period"],
+        "updated_at": now_ts(),
+        "roster_upserted": int(sync_result.get("upserted", 0)),
+    }
+
+
+LIST_PAYROLL_WEEKS_SQL = """
+    SELECT id, week_start, week_end, pay_period, period_note, created_at, updated_at
+    FROM payroll_weeks
+    WHERE user_id = ?
+    ORDER BY week_start DESC, updated_at DESC
+    LIMIT ?
+"""
 
 
 def list_payroll_weeks(user_id: int, limit: int = 200) -> list[dict[str, Any]]:
     with db_conn() as con:
-        rows = con.execute(
-            """
-            SELECT id, week_start, week_end, pay_period, period_note, created_at, updated_at
-            FROM payroll_weeks
-            WHERE user_id = ?
-            ORDER BY week_start DESC, updated_at DESC
-            LIMIT ?
-            """,
-            (user_id, max(1, min(1000, int(limit)))),
-        ).fetchall()
+        cur = con.cursor()
+        cur.row_factory = None
+        rows = cur.execute(LIST_PAYROLL_WEEKS_SQL, (user_id, max(1, min(1000, int(limit))))).fetchall()
     return [
         {
-            "id": int(row["id"]),
-            "week_start": str(row["week_start"]),
-            "week_end": str(row["week_end"]),
-            "pay_period": str(row["pay_period"]),
-            "period_note": str(row["period_note"] or ""),
-            "created_at": int(row["created_at"]),
-            "updated_at": int(row["updated_at"]),
+            "id": int(week_id),
+            "week_start": str(week_start),
+            "week_end": str(week_end),
+            "pay_period": str(pay_period),
+            "period_note": str(period_note or ""),
+            "created_at": int(created_at),
+            "updated_at": int(updated_at),
         }
-        for row in rows
+        for week_id, week_start, week_end, pay_period, period_note, created_at, updated_at in rows
     ]
 
 
@@ -1011,10 +1627,11 @@ def latest_payroll_week_payload(user_id: int) -> dict[str, Any] | None:
     with db_conn() as con:
         row = con.execute(
             """
-            SELECT payload_json
-            FROM payroll_weeks
-            WHERE user_id = ?
-            ORDER BY week_start DESC, updated_at DESC
+            SELECT CAST(p.payload_json AS BLOB) AS payload_json
+            FROM payroll_weeks w
+            JOIN payroll_week_payloads p ON p.week_id = w.id
+            WHERE w.user_id = ?
+            ORDER BY w.week_start DESC, w.updated_at DESC
             LIMIT 1
             """,
             (user_id,),
@@ -1022,7 +1639,7 @@ def latest_payroll_week_payload(user_id: int) -> dict[str, Any] | None:
     if row is None:
         return None
     try:
-        payload = json.loads(str(row["payload_json"] or "{}"))
+        payload = json_loads(row["payload_json"] or b"{}")
         if isinstance(payload, dict):
             return payload
     except Exception:
@@ -1032,7 +1649,7 @@ def latest_payroll_week_payload(user_id: int) -> dict[str, Any] | None:
 
 def resolve_home_company_from_workspace_row(row: dict[str, Any]) -> str:
     explicit = normalize_spaces(str(row.get("home_company") or row.get("homeCompany") or ""))
-    if explicit in DEFAULT_BURDEN_BY_COMPANY:
+    if explicit in COMPANY_KEYS:
         return explicit
     payroll_label = normalize_spaces(
         str(
@@ -1081,7 +1698,7 @@ def workspace_rows_to_employee_defaults(
             {
                 "name": name,
                 "home_company": home_company,
-                "home_company_label": dict(COMPANY_OPTIONS).get(home_company, "Scanio Moving"),
+                "home_company_label": COMPANY_LABELS.get(home_company, "Scanio Moving"),
                 "rate": safe_float(item.get("rate"), 0.0),
                 "is_hidden": hidden,
             }
@@ -1099,20 +1716,23 @@ def latest_saved_week_employee_defaults(user_id: int, *, include_hidden: bool) -
     return workspace_rows_to_employee_defaults(rows, include_hidden=include_hidden)
 
 
+GET_PAYROLL_WEEK_SQL = """
+    SELECT w.id, w.week_start, w.week_end, w.pay_period, w.period_note,
+           CAST(p.payload_json AS BLOB) AS payload_json,
+           w.created_at, w.updated_at
+    FROM payroll_weeks w
+    LEFT JOIN payroll_week_payloads p ON p.week_id = w.id
+    WHERE w.user_id = ? AND w.id = ?
+"""
+
+
 def get_payroll_week(user_id: int, period_id: int) -> dict[str, Any] | None:
     with db_conn() as con:
-        row = con.execute(
-            """
-            SELECT id, week_start, week_end, pay_period, period_note, payload_json, created_at, updated_at
-            FROM payroll_weeks
-            WHERE user_id = ? AND id = ?
-            """,
-            (user_id, period_id),
-        ).fetchone()
+        row = con.execute(GET_PAYROLL_WEEK_SQL, (user_id, period_id)).fetchone()
     if row is None:
         return None
     try:
-        payload = json.loads(str(row["payload_json"] or "{}"))
+        payload = json_loads(row["payload_json"] or b"{}")
     except Exception:
         payload = {}
     return {
@@ -1131,64 +1751,77 @@ def delete_payroll_week(user_id: int, period_id: int) -> bool:
     with db_conn() as con:
         con.execute("DELETE FROM payroll_weeks WHERE user_id = ? AND id = ?", (user_id, period_id))
         changed = int(con.execute("SELECT changes()").fetchone()[0])
+        if changed:
+            con.execute("DELETE FROM payroll_week_payloads WHERE week_id = ?", (period_id,))
     return changed > 0
 
 
 def extract_source_names_from_batch(batch_csv: Path, exclude_weekly_overtime: bool, out_csv: Path) -> list[str]:
     include_weekly_overtime = not exclude_weekly_overtime
     totals = flatten_timecard(batch_csv, include_weekly_overtime=include_weekly_overtime)
-    write_flat_csv(out_csv, totals)
-    return sorted({name for (name, _company) in totals.keys()})
+    return sorted(write_flat_csv(out_csv, totals))
 
 
 def create_job(user_id: int) -> str:
     job_id = secrets.token_hex(12)
-    ts = now_ts()
     with db_conn() as con:
         con.execute(
-            "INSERT INTO jobs(id, user_id, status, created_at, updated_at) VALUES(?,?,?,?,?)",
-            (job_id, user_id, "queued", ts, ts),
+            f"INSERT INTO jobs(id, user_id, status, created_at, updated_at) VALUES(?,?,?,{SQL_NOW},{SQL_NOW})",
+            (job_id, user_id, "queued"),
         )
     return job_id
 
 
+UPSERT_JOB_LOG_SQL = """
+    INSERT INTO job_logs(job_id, log_text) VALUES(?,?)
+    ON CONFLICT(job_id) DO UPDATE SET log_text = excluded.log_text
+"""
+
+
+@lru_cache(maxsize=32)
+def update_job_sql(columns: tuple[str, ...]) -> str:
+    assignments = "".join(f"{column} = ?, " for column in columns)
+    return f"UPDATE jobs SET {assignments}updated_at = {SQL_NOW} WHERE id = ?"
+
+
 def update_job(job_id: str, **fields: Any) -> None:
     if not fields:
         return
-    columns = []
-    values: list[Any] = []
-    for key, value in fields.items():
-        columns.append(f"{key} = ?")
-        values.append(value)
-    columns.append("updated_at = ?")
-    values.append(now_ts())
+    has_log = "log_text" in fields
+    log_text = fields.pop("log_text", None)
+    columns = tuple(sorted(fields))
+    values = [fields[column] for column in columns]
     values.append(job_id)
     with db_conn() as con:
-        con.execute(f"UPDATE jobs SET {', '.join(columns)} WHERE id = ?", values)
+        con.execute(update_job_sql(columns), values)
+        if has_log:
+            con.execute(UPSERT_JOB_LOG_SQL, (job_id, log_text))
+
+
+LIST_JOBS_SQL = """
+    SELECT id, status, created_at, updated_at, error_text, output_filename
+    FROM jobs
+    WHERE user_id = ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
 
 
 def list_jobs(user_id: int, limit: int = 30) -> list[dict[str, Any]]:
     with db_conn() as con:
-        rows = con.execute(
-            """
-            SELECT id, status, created_at, updated_at, error_text, output_filename
-            FROM jobs
-            WHERE user_id = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-            """,
-            (user_id, limit),
-        ).fetchall()
+        cur = con.cursor()
+        cur.row_factory = None
+        rows = cur.execute(LIST_JOBS_SQL, (user_id, limit)).fetchall()
     return [
         {
-            "id": str(row["id"]),
-            "status": str(row["status"]),
-            "created_at": int(row["created_at"]),
-            "updated_at": int(row["updated_at"]),
-            "error_text": str(row["error_text"] or ""),
-            "output_filename": str(row["output_filename"] or ""),
+            "id": str(job_id),
+            "status": str(status),
+            "created_at": int(created_at),
+            "updated_at": int(updated_at),
+            "error_text": str(error_text or ""),
+            "output_filename": str(output_filename or ""),
         }
-        for row in rows
+        for job_id, status, created_at, updated_at, error_text, output_filename in rows
     ]
 
 
@@ -1221,11 +1854,16 @@ def process_job(
         tip_summary = job_dir / "tips_simple.csv"
         roster_json = job_dir / "roster.json"
 
-        batch_names = extract_source_names_from_batch(batch_path, exclude_weekly_overtime, simplified_hours)
-        tip_totals, _, _ = load_tips_csv(tip_path)
-        source_names = sorted(set(batch_names) | set(tip_totals.keys()))
+        # The batch flatten and the tip/roster loads are independent; run them side by side.
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            batch_future = prefetch.submit(
+                extract_source_names_from_batch, batch_path, exclude_weekly_overtime, simplified_hours
+            )
+            tip_totals, _, _ = load_tips_csv(tip_path)
+            employees = get_employees(user_id)
+            batch_names = batch_future.result()
+        source_names = sorted({*batch_names, *tip_totals})
 
-        employees = get_employees(user_id)
         roster_names = [item["name"] for item in employees]
         _, unmatched = match_names(roster_names, source_names)
 
@@ -1234,23 +1872,25 @@ def process_job(
             raise ValueError("Missing company assignment for: " + ", ".join(missing_assignments))
 
         if unmatched:
-            latest = get_employees(user_id)
+            new_rows: list[tuple[str, str, float]] = []
+            default_rates = default_rates_by_company(employees)
             for unknown_name in unmatched:
                 assigned = assignment_map[unknown_name]
                 company = str(assigned.get("home_company", "scanio_moving"))
-                if company not in DEFAULT_BURDEN_BY_COMPANY:
+                if company not in COMPANY_KEYS:
                     company = "scanio_moving"
                 rate_text = normalize_spaces(str(assigned.get("rate", "")))
                 if rate_text:
                     try:
                         rate = float(rate_text)
                     except ValueError:
-                        rate = infer_default_rate(company, latest)
+                        rate = default_rates.get(company, 0.0)
                 else:
-                    rate = infer_default_rate(company, latest)
-                upsert_employee(user_id, unknown_name, company, rate)
+                    rate = default_rates.get(company, 0.0)
+                new_rows.append((unknown_name, company, rate))
+            upsert_employees_many(user_id, new_rows)
+            employees = get_employees(user_id)
 
-        employees = get_employees(user_id)
         write_roster_json(roster_json, employees)
 
         template_path = template_override_path or get_default_template_path(user_id)
@@ -1280,7 +1920,7 @@ def process_job(
             ),
         )
     except Exception as exc:
-        update_job(job_id, status="failed", error_text=str(exc)[:4000], log_text=traceback.format_exc()[:8000])
+        update_job(job_id, status="failed", error_text=str(exc)[:4000], log_text=traceback.format_exc(limit=20)[:8000])
 
 
 def submit_job(
@@ -1293,18 +1933,47 @@ def submit_job(
     exclude_weekly_overtime: bool,
     assignment_map: dict[str, dict[str, Any]],
 ) -> None:
-    future = JOB_EXECUTOR.submit(
-        process_job,
-        user_id=user_id,
-        job_id=job_id,
-        batch_path=batch_path,
-        tip_path=tip_path,
-        template_override_path=template_override_path,
-        exclude_weekly_overtime=exclude_weekly_overtime,
-        assignment_map=assignment_map,
-    )
+    global JOB_EXECUTOR
+    job_kwargs = {
+        "user_id": user_id,
+        "job_id": job_id,
+        "batch_path": batch_path,
+        "tip_path": tip_path,
+        "template_override_path": template_override_path,
+        "exclude_weekly_overtime": exclude_weekly_overtime,
+        "assignment_map": assignment_map,
+    }
     with JOB_FUTURES_LOCK:
+        try:
+            future = JOB_EXECUTOR.submit(process_job, **job_kwargs)
+        except BrokenProcessPool:
+            JOB_EXECUTOR = new_job_executor()
+            future = JOB_EXECUTOR.submit(process_job, **job_kwargs)
         JOB_FUTURES[job_id] = future
+    future.add_done_callback(lambda done: finish_job_future(job_id, done))
+    notify_job_change()
+
+
+def finish_job_future(job_id: str, future: Any) -> None:
+    with JOB_FUTURES_LOCK:
+        JOB_FUTURES.pop(job_id, None)
+    # process_job records its own failures; this only fires when the worker process itself died.
+    if not future.cancelled() and future.exception() is not None:
+        update_job(job_id, status="failed", error_text=f"Worker process failed: {future.exception()}"[:4000])
+    notify_job_change()
+
+
+def fail_unsubmitted_job(job_id: str, future: Any) -> None:
+    if future.exception() is not None:
+        update_job(job_id, status="failed", error_text=f"Could not start job: {future.exception()}"[:4000])
+        notify_job_change()
+
+
+def notify_job_change() -> None:
+    global JOB_CHANGE_SEQ
+    with JOB_CHANGED:
+        JOB_CHANGE_SEQ += 1
+        JOB_CHANGED.notify_all()
 
 
 LOGIN_PAGE = """<!doctype html>
@@ -1640,6 +2309,8 @@ HTML_PAGE = """<!doctype html>
     let unknownNames = [];
     let unknownDefaults = {};
     let jobsPollTimer = null;
+    let jobsStream = null;
+    let jobsEtag = "";
 
     const companyOptions = [
       { value: "scanio_moving", label: "Scanio Moving" },
@@ -1745,6 +2416,28 @@ HTML_PAGE = """<!doctype html>
       await fetch("/api/auth/logout", { method: "POST" });
       document.getElementById("appPanel").classList.add("hidden");
       document.getElementById("authPanel").classList.remove("hidden");
+      stopJobUpdates();
+      jobsEtag = "";
+    }
+
+    function startJobUpdates() {
+      if (window.EventSource) {
+        if (!jobsStream) {
+          jobsStream = new EventSource("/api/jobs/stream");
+          jobsStream.onmessage = (event) => renderJobs(JSON.parse(event.data));
+        }
+        return;
+      }
+      if (!jobsPollTimer) {
+        jobsPollTimer = setInterval(loadJobs, 2500);
+      }
+    }
+
+    function stopJobUpdates() {
+      if (jobsStream) {
+        jobsStream.close();
+        jobsStream = null;
+      }
       if (jobsPollTimer) {
         clearInterval(jobsPollTimer);
         jobsPollTimer = null;
@@ -1764,9 +2457,7 @@ HTML_PAGE = """<!doctype html>
       await loadEmployees();
       await loadSettings();
       await loadJobs();
-      if (!jobsPollTimer) {
-        jobsPollTimer = setInterval(loadJobs, 2500);
-      }
+      startJobUpdates();
     }
 
     async function loadSettings() {
@@ -1906,8 +2597,15 @@ HTML_PAGE = """<!doctype html>
     }
 
     async function loadJobs() {
-      const { res, data } = await apiJson("/api/jobs");
+      const headers = jobsEtag ? { "If-None-Match": jobsEtag } : {};
+      const { res, data } = await apiJson("/api/jobs", { cache: "no-store", headers });
+      if (res.status === 304) return;
       if (!res.ok || !data.ok) return;
+      jobsEtag = res.headers.get("ETag") || "";
+      renderJobs(data);
+    }
+
+    function renderJobs(data) {
       const tbody = document.getElementById("jobsTbody");
       tbody.innerHTML = "";
       for (const job of (data.jobs || [])) {
@@ -2037,7 +2735,55 @@ HTML_PAGE = """<!doctype html>
 """
 
 
+def prepare_page(html: str) -> tuple[bytes, bytes, str]:
+    body = html.encode("utf-8")
+    return body, gzip.compress(body, 9), '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+LOGIN_PAGE_BODY = prepare_page(LOGIN_PAGE)
+HTML_PAGE_BODY = prepare_page(HTML_PAGE)
+
+
+@lru_cache(maxsize=1)
+def prepared_workspace_page(stamp: tuple[int, int] | None) -> tuple[bytes, bytes, str]:
+    return prepare_page(load_workspace_ui_html())
+
+
+def workspace_page() -> tuple[bytes, bytes, str]:
+    # Keyed on the UI file's mtime/size so edits to payroll_workspace_ui.html still show up without a restart.
+    try:
+        stat = (APP_ROOT / WORKSPACE_UI_FILENAME).stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        stamp = None
+    return prepared_workspace_page(stamp)
+
+
 class PayrollWebRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive lets the UI's back-to-back API calls share one connection; idle connections drop after `timeout`.
+    protocol_version = "HTTP/1.1"
+    timeout = 30
+    # Buffer the response so headers and body leave in one send; handle_one_request flushes after each request.
+    wbufsize = 1 << 16
+
+    def setup(self) -> None:
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def end_headers(self) -> None:
+        if self.command == "POST" and not self.post_body_drainable():
+            # Handlers may answer (e.g. 401) without reading the request body; only small leftovers get drained.
+            self.send_header("Connection", "close")
+        super().end_headers()
+
+    def post_body_drainable(self) -> bool:
+        body = getattr(self, "body", None)
+        return (
+            isinstance(body, RequestBody)
+            and "Transfer-Encoding" not in self.headers
+            and body.remaining <= POST_DRAIN_LIMIT
+        )
+
     def require_auth(self) -> AuthUser | None:
         user = auth_user_from_handler(self)
         if user is None:
@@ -2045,162 +2791,55 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
             return None
         return user
 
+    GET_ROUTES = {
+        "/": "handle_root",
+        "/login": "handle_login_page",
+        "/workspace": "handle_workspace_page",
+        "/converter": "handle_converter_page",
+        "/healthz": "handle_healthz",
+        "/api/me": "handle_me",
+        "/api/workspace/employees": "handle_workspace_employees",
+        "/api/workspace/periods": "handle_workspace_periods",
+        "/api/settings": "handle_settings",
+        "/api/employees": "handle_employees",
+        "/api/jobs": "handle_jobs",
+        "/api/jobs/stream": "handle_job_stream",
+    }
+    GET_PATTERNS = (
+        (re.compile(r"/api/workspace/periods/(\d+)"), "handle_workspace_period"),
+        (re.compile(r"/api/jobs/([a-f0-9]+)/download"), "handle_job_download"),
+    )
+    POST_ROUTES = {
+        "/api/auth/register": "handle_register",
+        "/api/auth/login": "handle_login",
+        "/api/auth/logout": "handle_logout",
+        "/api/workspace/export-xlsx": "handle_workspace_export_xlsx",
+        "/api/workspace/save": "handle_workspace_save",
+        "/api/workspace/save_bulk": "handle_workspace_save_bulk",
+        "/api/workspace/delete": "handle_workspace_delete",
+        "/api/template": "handle_set_template",
+        "/api/preview": "handle_preview",
+        "/api/jobs/submit": "handle_submit_job",
+        "/api/employees/add": "handle_add_employee",
+        "/api/employees/update": "handle_update_employees",
+        "/api/employees/remove": "handle_remove_employees",
+        "/api/employees/hide": "handle_hide_employees",
+    }
+
     def do_GET(self) -> None:
         parsed = urlparse(self.path)
         path = parsed.path
 
         try:
-            if path == "/":
-                user = auth_user_from_handler(self)
-                redirect_response(self, "/workspace" if user else "/login")
-                return
-            if path == "/login":
-                user = auth_user_from_handler(self)
-                if user is not None:
-                    redirect_response(self, "/workspace")
-                    return
-                html_response(self, LOGIN_PAGE)
-                return
-            if path == "/workspace":
-                user = auth_user_from_handler(self)
-                if user is None:
-                    redirect_response(self, "/login")
-                    return
-                html_response(self, load_workspace_ui_html())
-                return
-            if path == "/converter":
-                user = auth_user_from_handler(self)
-                if user is None:
-                    redirect_response(self, "/login")
-                    return
-                html_response(self, HTML_PAGE)
-                return
-            if path == "/healthz":
-                text_response(self, "ok")
-                return
-            if path == "/api/me":
-                user = auth_user_from_handler(self)
-                if user is None:
-                    json_response(self, {"ok": False, "error": "Unauthorized"}, status=401)
-                    return
-                json_response(self, {"ok": True, "user_id": user.user_id, "email": user.email})
-                return
-            if path == "/api/workspace/employees":
-                user = self.require_auth()
-                if user is None:
-                    return
-                ensure_user_employees_seeded(user.user_id)
-                query = parse_qs(parsed.query)
-                include_hidden = parse_bool_flag((query.get("include_hidden") or ["0"])[0], False)
-                rows = latest_saved_week_employee_defaults(user.user_id, include_hidden=include_hidden)
-                source = "latest_saved_week"
-                if not rows:
-                    rows = get_employees(user.user_id, include_hidden=include_hidden)
-                    source = "employees_table"
-                json_response(
-                    self,
-                    {
-                        "ok": True,
-                        "source": source,
-                        "employees": [
-                            {
-                                "name": item["name"],
-                                "home_company": item["home_company"],
-                                "home_company_label": dict(COMPANY_OPTIONS)[item["home_company"]],
-                                "rate": item["rate"],
-                                "is_hidden": bool(item.get("is_hidden", False)),
-                            }
-                            for item in rows
-                        ],
-                    },
-                )
-                return
-            if path == "/api/workspace/periods":
-                user = self.require_auth()
-                if user is None:
-                    return
-                query = parse_qs(parsed.query)
-                try:
-                    limit = max(1, min(500, int((query.get("limit") or ["200"])[0])))
-                except Exception:
-                    limit = 200
-                json_response(self, {"ok": True, "periods": list_payroll_weeks(user.user_id, limit=limit)})
-                return
-            workspace_match = re.fullmatch(r"/api/workspace/periods/(\d+)", path)
-            if workspace_match:
-                user = self.require_auth()
-                if user is None:
-                    return
-                period = get_payroll_week(user.user_id, int(workspace_match.group(1)))
-                if period is None:
-                    json_response(self, {"ok": False, "error": "Saved week not found"}, status=404)
-                    return
-                json_response(self, {"ok": True, "period": period})
-                return
-            if path == "/api/settings":
-                user = self.require_auth()
-                if user is None:
-                    return
-                ensure_user_default_template(user.user_id)
-                template_path = get_default_template_path(user.user_id)
-                json_response(
-                    self,
-                    {
-                        "ok": True,
-                        "default_template_path": str(template_path) if template_path else "",
-                        "company_options": [{"value": key, "label": label} for key, label in COMPANY_OPTIONS],
-                    },
-                )
+            route = self.GET_ROUTES.get(path)
+            if route is not None:
+                getattr(self, route)(parsed)
                 return
-            if path == "/api/employees":
-                user = self.require_auth()
-                if user is None:
-                    return
-                ensure_user_employees_seeded(user.user_id)
-                query = parse_qs(parsed.query)
-                include_hidden = parse_bool_flag((query.get("include_hidden") or ["0"])[0], False)
-                json_response(
-                    self,
-                    {"ok": True, "employees": get_employees(user.user_id, include_hidden=include_hidden)},
-                )
-                return
-            if path == "/api/jobs":
-                user = self.require_auth()
-                if user is None:
-                    return
-                query = parse_qs(parsed.query)
-                try:
-                    limit = max(1, min(100, int((query.get("limit") or ["30"])[0])))
-                except Exception:
-                    limit = 30
-                json_response(self, {"ok": True, "jobs": list_jobs(user.user_id, limit=limit)})
-                return
-
-            match = re.fullmatch(r"/api/jobs/([a-f0-9]+)/download", path)
-            if match:
-                user = self.require_auth()
-                if user is None:
-                    return
-                job_id = match.group(1)
-                row = get_job(user.user_id, job_id)
-                if row is None:
-                    json_response(self, {"ok": False, "error": "Job not found"}, status=404)
-                    return
-                if str(row["status"]) != "completed":
-                    json_response(self, {"ok": False, "error": "Job not complete"}, status=400)
-                    return
-                output_path = Path(str(row["output_path"] or ""))
-                if not output_path.exists():
-                    json_response(self, {"ok": False, "error": "Output file missing"}, status=404)
+            for pattern, route in self.GET_PATTERNS:
+                match = pattern.fullmatch(path)
+                if match:
+                    getattr(self, route)(parsed, match.group(1))
                     return
-                file_response(
-                    self,
-                    output_path.read_bytes(),
-                    filename=str(row["output_filename"] or output_path.name),
-                    content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                )
-                return
-
             text_response(self, "Not Found", status=404)
         except Exception as exc:
             json_response(
@@ -2213,49 +2852,165 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
                 status=500,
             )
 
+    def handle_root(self, parsed: ParseResult) -> None:
+        user = auth_user_from_handler(self)
+        redirect_response(self, "/workspace" if user else "/login")
+
+    def handle_login_page(self, parsed: ParseResult) -> None:
+        user = auth_user_from_handler(self)
+        if user is not None:
+            redirect_response(self, "/workspace")
+            return
+        page_response(self, LOGIN_PAGE_BODY)
+
+    def handle_workspace_page(self, parsed: ParseResult) -> None:
+        user = auth_user_from_handler(self)
+        if user is None:
+            redirect_response(self, "/login")
+            return
+        page_response(self, workspace_page())
+
+    def handle_converter_page(self, parsed: ParseResult) -> None:
+        user = auth_user_from_handler(self)
+        if user is None:
+            redirect_response(self, "/login")
+            return
+        page_response(self, HTML_PAGE_BODY)
+
+    def handle_healthz(self, parsed: ParseResult) -> None:
+        text_response(self, "ok")
+
+    def handle_me(self, parsed: ParseResult) -> None:
+        user = auth_user_from_handler(self)
+        if user is None:
+            json_response(self, {"ok": False, "error": "Unauthorized"}, status=401)
+            return
+        json_response(self, {"ok": True, "user_id": user.user_id, "email": user.email})
+
+    def handle_workspace_employees(self, parsed: ParseResult) -> None:
+        user = self.require_auth()
+        if user is None:
+            return
+        ensure_user_employees_seeded(user.user_id)
+        query = parse_qs(parsed.query)
+        include_hidden = parse_bool_flag((query.get("include_hidden") or ["0"])[0], False)
+        rows = latest_saved_week_employee_defaults(user.user_id, include_hidden=include_hidden)
+        source = "latest_saved_week"
+        if not rows:
+            rows = get_employees(user.user_id, include_hidden=include_hidden)
+            source = "employees_table"
+        json_response(
+            self,
+            {
+                "ok": True,
+                "source": source,
+                "employees": [
+                    {
+                        "name": item["name"],
+                        "home_company": item["home_company"],
+                        "home_company_label": COMPANY_LABELS[item["home_company"]],
+                        "rate": item["rate"],
+                        "is_hidden": bool(item.get("is_hidden", False)),
+                    }
+                    for item in rows
+                ],
+            },
+        )
+
+    def handle_workspace_periods(self, parsed: ParseResult) -> None:
+        user = self.require_auth()
+        if user is None:
+            return
+        query = parse_qs(parsed.query)
+        try:
+            limit = max(1, min(500, int((query.get("limit") or ["200"])[0])))
+        except Exception:
+            limit = 200
+        etag_json_response(self, {"ok": True, "periods": list_payroll_weeks(user.user_id, limit=limit)})
+
+    def handle_workspace_period(self, parsed: ParseResult, period_id: str) -> None:
+        user = self.require_auth()
+        if user is None:
+            return
+        period = get_payroll_week(user.user_id, int(period_id))
+        if period is None:
+            json_response(self, {"ok": False, "error": "Saved week not found"}, status=404)
+            return
+        json_response(self, {"ok": True, "period": period})
+
+    def handle_settings(self, parsed: ParseResult) -> None:
+        user = self.require_auth()
+        if user is None:
+            return
+        ensure_user_default_template(user.user_id)
+        template_path = get_default_template_path(user.user_id)
+        json_response(
+            self,
+            {
+                "ok": True,
+                "default_template_path": str(template_path) if template_path else "",
+                "company_options": COMPANY_OPTION_ITEMS,
+            },
+        )
+
+    def handle_employees(self, parsed: ParseResult) -> None:
+        user = self.require_auth()
+        if user is None:
+            return
+        ensure_user_employees_seeded(user.user_id)
+        query = parse_qs(parsed.query)
+        include_hidden = parse_bool_flag((query.get("include_hidden") or ["0"])[0], False)
+        etag_body_response(self, *employee_list_body(user.user_id, include_hidden))
+
+    def handle_jobs(self, parsed: ParseResult) -> None:
+        user = self.require_auth()
+        if user is None:
+            return
+        etag_json_response(self, {"ok": True, "jobs": list_jobs(user.user_id, limit=job_list_limit(parsed))})
+
+    def handle_job_stream(self, parsed: ParseResult) -> None:
+        user = self.require_auth()
+        if user is None:
+            return
+        job_stream_response(self, user.user_id, job_list_limit(parsed))
+
+    def handle_job_download(self, parsed: ParseResult, job_id: str) -> None:
+        user = self.require_auth()
+        if user is None:
+            return
+        row = get_job(user.user_id, job_id)
+        if row is None:
+            json_response(self, {"ok": False, "error": "Job not found"}, status=404)
+            return
+        if str(row["status"]) != "completed":
+            json_response(self, {"ok": False, "error": "Job not complete"}, status=400)
+            return
+        output_path = Path(str(row["output_path"] or ""))
+        if not output_path.exists():
+            json_response(self, {"ok": False, "error": "Output file missing"}, status=404)
+            return
+        file_path_response(
+            self,
+            output_path,
+            filename=str(row["output_filename"] or output_path.name),
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
     def do_POST(self) -> None:
         parsed = urlparse(self.path)
         path = parsed.path
+        try:
+            length = int(self.headers.get("Content-Length", "0") or 0)
+        except ValueError:
+            length = 0
+        raw_rfile = self.rfile
+        self.body = RequestBody(raw_rfile, length)
+        self.rfile = self.body
 
         try:
-            if path == "/api/auth/register":
-                self.handle_register()
-                return
-            if path == "/api/auth/login":
-                self.handle_login()
-                return
-            if path == "/api/auth/logout":
-                self.handle_logout()
-                return
-            if path == "/api/workspace/export-xlsx":
-                self.handle_workspace_export_xlsx()
-                return
-            if path == "/api/workspace/save":
-                self.handle_workspace_save()
-                return
-            if path == "/api/workspace/delete":
-                self.handle_workspace_delete()
-                return
-            if path == "/api/template":
-                self.handle_set_template()
-                return
-            if path == "/api/preview":
-                self.handle_preview()
-                return
-            if path == "/api/jobs/submit":
-                self.handle_submit_job()
-                return
-            if path == "/api/employees/add":
-                self.handle_add_employee()
-                return
-            if path == "/api/employees/update":
-                self.handle_update_employees()
-                return
-            if path == "/api/employees/remove":
-                self.handle_remove_employees()
-                return
-            if path == "/api/employees/hide":
-                self.handle_hide_employees()
+            route = self.POST_ROUTES.get(path)
+            if route is not None:
+                getattr(self, route)()
                 return
             text_response(self, "Not Found", status=404)
         except Exception as exc:
@@ -2268,6 +3023,13 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
                 },
                 status=500,
             )
+        finally:
+            self.rfile = raw_rfile
+            if self.post_body_drainable() and not self.close_connection:
+                while self.body.read(POST_DRAIN_LIMIT):
+                    pass
+            else:
+                self.close_connection = True
 
     def handle_register(self) -> None:
         if not ALLOW_SELF_REGISTRATION:
@@ -2288,7 +3050,7 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
             json_response(self, {"ok": False, "error": "Password must be at least 8 characters"}, status=400)
             return
 
-        salt, digest = hash_password(password)
+        salt, digest = HASH_EXECUTOR.submit(hash_password, password).result()
         try:
             with db_conn() as con:
                 con.execute(
@@ -2314,12 +3076,14 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
         if row is None:
             json_response(self, {"ok": False, "error": "Invalid credentials"}, status=401)
             return
-        if not verify_password(password, str(row["password_salt"]), str(row["password_hash"])):
+        if not HASH_EXECUTOR.submit(
+            verify_password, password, str(row["password_salt"]), str(row["password_hash"])
+        ).result():
             json_response(self, {"ok": False, "error": "Invalid credentials"}, status=401)
             return
 
         token = create_session(int(row["id"]))
-        payload = json.dumps({"ok": True}).encode("utf-8")
+        payload = json_dumps_bytes({"ok": True})
         self.send_response(200)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(payload)))
@@ -2333,9 +3097,10 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
         cookie.load(cookie_header)
         morsel = cookie.get(SESSION_COOKIE_NAME)
         if morsel is not None:
+            forget_session(morsel.value)
             with db_conn() as con:
                 con.execute("DELETE FROM sessions WHERE token = ?", (morsel.value,))
-        payload = json.dumps({"ok": True}).encode("utf-8")
+        payload = json_dumps_bytes({"ok": True})
         self.send_response(200)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(payload)))
@@ -2418,9 +3183,16 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
             roster_json = tmp / "workspace_roster.json"
             output_xlsx = tmp / output_filename
 
-            write_workspace_hours_csv(hours_csv, workspace_rows)
-            write_workspace_tips_csv(tips_csv, workspace_rows)
-            write_workspace_roster_json(roster_json, workspace_rows)
+            # Write the three fill inputs side by side while the kernel reads the template ahead.
+            with ThreadPoolExecutor(max_workers=3) as writers:
+                pending = [
+                    writers.submit(write_workspace_hours_csv, hours_csv, workspace_rows),
+                    writers.submit(write_workspace_tips_csv, tips_csv, workspace_rows),
+                    writers.submit(write_workspace_roster_json, roster_json, workspace_rows),
+                ]
+                prefetch_file(template_path)
+                for future in pending:
+                    future.result()
 
             try:
                 fill_workbook(
@@ -2439,9 +3211,9 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
                 )
                 return
 
-            file_response(
+            file_path_response(
                 self,
-                output_xlsx.read_bytes(),
+                output_xlsx,
                 filename=output_xlsx.name,
                 content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             )
@@ -2452,58 +3224,44 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
             return
 
         data = parse_json_body(self)
-        week_start_raw = normalize_spaces(str(data.get("week_start", "")))
-        week_start_date = parse_iso_date(week_start_raw)
-        if week_start_date is None:
-            json_response(self, {"ok": False, "error": "week_start must be YYYY-MM-DD"}, status=400)
+        try:
+            payload = build_workspace_week(data)
+        except ValueError as exc:
+            json_response(self, {"ok": False, "error": str(exc)}, status=400)
             return
 
-        week_end_date = week_start_date + timedelta(days=6)
-        week_end_raw = normalize_spaces(str(data.get("week_end", "")))
-        parsed_week_end = parse_iso_date(week_end_raw)
-        if parsed_week_end is not None:
-            week_end_date = parsed_week_end
-
-        pay_period = normalize_spaces(str(data.get("pay_period", "")))
-        if not pay_period:
-            pay_period = f"{format_us_date(week_start_date)} - {format_us_date(week_end_date)}"
+        json_response(self, save_workspace_week(user.user_id, payload))
 
-        period_note = str(data.get("period_note", "")).strip()
-        raw_rows = data.get("employees", [])
-        if not isinstance(raw_rows, list):
-            json_response(self, {"ok": False, "error": "employees must be a list"}, status=400)
+    def handle_workspace_save_bulk(self) -> None:
+        user = self.require_auth()
+        if user is None:
             return
 
-        payload = {
-            "week_start": week_start_date.isoformat(),
-            "week_end": week_end_date.isoformat(),
-            "pay_period": pay_period,
-            "period_note": period_note,
-            "employees": raw_rows,
-        }
-
-        sync_result = upsert_employees_from_workspace_rows(user.user_id, raw_rows)
+        data = parse_json_body(self)
+        weeks = data.get("weeks", [])
+        if not isinstance(weeks, list):
+            json_response(self, {"ok": False, "error": "weeks must be a list"}, status=400)
+            return
+        if len(weeks) > WORKSPACE_BULK_MAX_WEEKS:
+            json_response(
+                self, {"ok": False, "error": f"At most {WORKSPACE_BULK_MAX_WEEKS} weeks per request"}, status=400
+            )
+            return
 
-        period_id = save_payroll_week(
-            user_id=user.user_id,
-            week_start=payload["week_start"],
-            week_end=payload["week_end"],
-            pay_period=payload["pay_period"],
-            period_note=payload["period_note"],
-            payload_json=json.dumps(payload, separators=(",", ":")),
-        )
+        # Valid weeks are saved in one transaction; an invalid week is reported in its slot and skipped.
+        results: list[dict[str, Any]] = []
+        with db_conn() as con:
+            for item in weeks:
+                try:
+                    payload = build_workspace_week(item if isinstance(item, dict) else {})
+                except ValueError as exc:
+                    results.append({"ok": False, "error": str(exc)})
+                    continue
+                results.append(save_workspace_week(user.user_id, payload, con))
 
         json_response(
             self,
-            {
-                "ok": True,
-                "period_id": period_id,
-                "week_start": payload["week_start"],
-                "week_end": payload["week_end"],
-                "pay_period": payload["pay_period"],
-                "updated_at": now_ts(),
-                "roster_upserted": int(sync_result.get("upserted", 0)),
-            },
+            {"ok": True, "saved_count": sum(1 for item in results if item["ok"]), "results": results},
         )
 
     def handle_workspace_delete(self) -> None:
@@ -2541,16 +3299,16 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
             json_response(self, {"ok": False, "error": "Template XLSX is required"}, status=400)
             return
 
-        filename, file_bytes = template_file
+        filename, file_handle = template_file
         template_name = safe_filename(filename, "default_template.xlsx")
         if not template_name.lower().endswith(".xlsx"):
             template_name += ".xlsx"
 
         udir = user_dir(user.user_id)
         target = udir / "templates" / template_name
-        target.write_bytes(file_bytes)
+        save_upload(file_handle, target)
         default_copy = udir / "templates" / "default_template.xlsx"
-        shutil.copy2(target, default_copy)
+        fast_copy_file(target, default_copy)
 
         set_default_template_path(user.user_id, default_copy)
         sync = sync_employees_from_template(user.user_id, default_copy)
@@ -2583,30 +3341,31 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
 
         with tempfile.TemporaryDirectory() as tmpdir:
             tmp = Path(tmpdir)
-            batch_name, batch_bytes = batch_file
-            tip_name, tip_bytes = tip_file
+            batch_name, batch_handle = batch_file
+            tip_name, tip_handle = tip_file
 
             batch_path = tmp / safe_filename(batch_name, "batch.csv")
             tip_path = tmp / safe_filename(tip_name, "tips.csv")
-            simple_path = tmp / "simple.csv"
 
-            batch_path.write_bytes(batch_bytes)
-            tip_path.write_bytes(tip_bytes)
+            save_upload(batch_handle, batch_path)
+            save_upload(tip_handle, tip_path)
 
-            batch_names = extract_source_names_from_batch(batch_path, exclude_weekly_overtime, simple_path)
+            # Preview only needs the names, so skip writing the flattened hours CSV.
+            totals = flatten_timecard(batch_path, include_weekly_overtime=not exclude_weekly_overtime)
             tip_totals, _, _ = load_tips_csv(tip_path)
-            source_names = sorted(set(batch_names) | set(tip_totals.keys()))
+            source_names = sorted({name for name, _company in totals} | tip_totals.keys())
 
         employees = get_employees(user.user_id)
         roster_names = [item["name"] for item in employees]
         _, unmatched = match_names(roster_names, source_names)
 
+        suggested_company = "scanio_moving"
+        suggested_rate = default_rates_by_company(employees).get(suggested_company, 0.0)
         default_assignments: dict[str, dict[str, Any]] = {}
         for unknown_name in unmatched:
-            suggested_company = "scanio_moving"
             default_assignments[unknown_name] = {
                 "home_company": suggested_company,
-                "rate": infer_default_rate(suggested_company, employees),
+                "rate": suggested_rate,
             }
 
         json_response(
@@ -2635,7 +3394,7 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
         exclude_weekly_overtime = parse_bool_flag(form.getfirst("exclude_weekly_overtime"), True)
         assignments_raw = form.getfirst("assignments_json", "[]")
         try:
-            assignments_list = json.loads(assignments_raw)
+            assignments_list = json_loads(assignments_raw)
         except Exception:
             assignments_list = []
 
@@ -2646,7 +3405,7 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
                     continue
                 name = normalize_spaces(str(item.get("name", "")))
                 company = str(item.get("home_company", ""))
-                if not name or company not in DEFAULT_BURDEN_BY_COMPANY:
+                if not name or company not in COMPANY_KEYS:
                     continue
                 assignment_map[name] = {
                     "home_company": company,
@@ -2657,20 +3416,21 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
         job_dir = user_dir(user.user_id) / "jobs" / job_id
         job_dir.mkdir(parents=True, exist_ok=True)
 
-        batch_name, batch_bytes = batch_file
-        tip_name, tip_bytes = tip_file
+        batch_name, batch_handle = batch_file
+        tip_name, tip_handle = tip_file
         batch_path = job_dir / safe_filename(batch_name, "batch.csv")
         tip_path = job_dir / safe_filename(tip_name, "tips.csv")
-        batch_path.write_bytes(batch_bytes)
-        tip_path.write_bytes(tip_bytes)
+        save_upload(batch_handle, batch_path)
+        save_upload(tip_handle, tip_path)
 
         template_override_path: Path | None = None
         if template_file is not None:
-            template_name, template_bytes = template_file
+            template_name, template_handle = template_file
             template_override_path = job_dir / safe_filename(template_name, "template.xlsx")
-            template_override_path.write_bytes(template_bytes)
+            save_upload(template_handle, template_override_path)
 
-        submit_job(
+        JOB_SUBMIT_EXECUTOR.submit(
+            submit_job,
             user_id=user.user_id,
             job_id=job_id,
             batch_path=batch_path,
@@ -2678,7 +3438,7 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
             template_override_path=template_override_path,
             exclude_weekly_overtime=exclude_weekly_overtime,
             assignment_map=assignment_map,
-        )
+        ).add_done_callback(lambda done: fail_unsubmitted_job(job_id, done))
 
         json_response(self, {"ok": True, "job_id": job_id, "status": "queued"})
 
@@ -2695,7 +3455,7 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
         if not name:
             json_response(self, {"ok": False, "error": "Employee name is required"}, status=400)
             return
-        if home_company not in DEFAULT_BURDEN_BY_COMPANY:
+        if home_company not in COMPANY_KEYS:
             json_response(self, {"ok": False, "error": "Invalid company"}, status=400)
             return
         try:
@@ -2707,7 +3467,7 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
             json_response(self, {"ok": False, "error": "Rate cannot be negative"}, status=400)
             return
 
-        upsert_employee(user.user_id, name, home_company, rate)
+        upsert_employees_many(user.user_id, [(name, home_company, rate)])
         json_response(self, {"ok": True, "name": name})
 
     def handle_update_employees(self) -> None:
@@ -2721,29 +3481,14 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
             json_response(self, {"ok": False, "error": "Invalid employees payload"}, status=400)
             return
 
-        updated_count = 0
-        for item in updates:
-            if not isinstance(item, dict):
-                continue
-            name = normalize_spaces(str(item.get("name", "")))
-            home_company = str(item.get("home_company", ""))
-            try:
-                rate = float(item.get("rate"))
-            except (TypeError, ValueError):
-                json_response(self, {"ok": False, "error": f"Invalid rate for {name}"}, status=400)
-                return
-            if not name:
-                continue
-            if home_company not in DEFAULT_BURDEN_BY_COMPANY:
-                json_response(self, {"ok": False, "error": f"Invalid company for {name}"}, status=400)
-                return
-            if rate < 0:
-                json_response(self, {"ok": False, "error": f"Rate cannot be negative for {name}"}, status=400)
-                return
-            upsert_employee(user.user_id, name, home_company, rate)
-            updated_count += 1
+        try:
+            rows = clean_employee_updates(updates)
+        except ValueError as exc:
+            json_response(self, {"ok": False, "error": str(exc)}, status=400)
+            return
 
-        json_response(self, {"ok": True, "updated_count": updated_count})
+        upsert_employees_many(user.user_id, rows)
+        json_response(self, {"ok": True, "updated_count": len(rows)})
 
     def handle_remove_employees(self) -> None:
         user = self.require_auth()
@@ -2785,9 +3530,57 @@ class PayrollWebRequestHandler(BaseHTTPRequestHandler):
         return
 
 
+class PayrollHTTPServer(ThreadingHTTPServer):
+    # Finished connection threads wait for the next connection instead of exiting, so bursts reuse threads.
+    # A new thread starts whenever none is idle, so idle keep-alive sockets and job streams never queue other
+    # clients behind them; threads idle for HTTP_THREAD_IDLE_SECONDS exit. A deeper listen backlog holds
+    # accept bursts instead of refusing them.
+    request_queue_size = 128
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # Set before binding: a failed bind calls server_close, which needs them.
+        self.pending: queue.SimpleQueue[tuple[Any, Any] | None] = queue.SimpleQueue()
+        self.idle_lock = threading.Lock()
+        self.idle_threads = 0
+        super().__init__(*args, **kwargs)
+
+    def serve_pending(self, item: tuple[Any, Any] | None) -> None:
+        while item is not None:
+            self.process_request_thread(*item)
+            with self.idle_lock:
+                self.idle_threads += 1
+            while True:
+                try:
+                    item = self.pending.get(timeout=HTTP_THREAD_IDLE_SECONDS)
+                    break
+                except queue.Empty:
+                    with self.idle_lock:
+                        # process_request only queues while it counts an idle thread, so an empty queue here
+                        # means nothing is waiting for this one.
+                        if self.pending.empty():
+                            self.idle_threads -= 1
+                            return
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        with self.idle_lock:
+            if self.idle_threads:
+                self.idle_threads -= 1
+                self.pending.put((request, client_address))
+                return
+        threading.Thread(target=self.serve_pending, args=((request, client_address),), daemon=True).start()
+
+    def server_close(self) -> None:
+        super().server_close()
+        with self.idle_lock:
+            for _ in range(self.idle_threads):
+                self.pending.put(None)
+            self.idle_threads = 0
+
+
 def run_web_app(host: str = "0.0.0.0", port: int = 8080) -> None:
     init_storage()
-    server = ThreadingHTTPServer((host, port), PayrollWebRequestHandler)
+    warm_db_pool()
+    server = PayrollHTTPServer((host, port), PayrollWebRequestHandler)
     print(f"Payroll web app running on http://{host}:{port}")
     print(f"Data directory: {DATA_DIR}")
     try:
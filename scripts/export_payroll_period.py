@@ -8,6 +8,11 @@ import json
 import sqlite3
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Export saved payroll week payload to JSON.")
@@ -34,9 +39,52 @@ def parse_args() -> argparse.Namespace:
         default="payroll_period_exports",
         help="Folder where exported JSON will be written.",
     )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Write the stored payload bytes as-is, even when they contain non-ASCII text (default escapes it).",
+    )
     return parser.parse_args()
 
 
+# Read-side tuning only. The web app switches the database to WAL (a persistent setting), so these
+# reads run alongside its writer without blocking it.
+READ_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+# NULL parameters disable their filter, so each lookup is a single static statement. {payload} and {join}
+# come from PAYLOAD_SOURCES.
+LATEST_PERIOD_SQL = """
+    SELECT w.week_start, w.week_end, CAST({payload} AS BLOB) AS payload_json
+    FROM payroll_weeks w
+    {join}
+    WHERE (:user_id IS NULL OR w.user_id = :user_id)
+    ORDER BY w.updated_at DESC, w.id DESC
+    LIMIT 1
+"""
+
+WEEK_PERIOD_SQL = """
+    SELECT w.week_start, w.week_end, CAST({payload} AS BLOB) AS payload_json
+    FROM payroll_weeks w
+    {join}
+    WHERE w.week_start = :week_start
+      AND (:week_end IS NULL OR w.week_end = :week_end)
+      AND (:user_id IS NULL OR w.user_id = :user_id)
+    ORDER BY w.updated_at DESC, w.id DESC
+    LIMIT 1
+"""
+
+# A database the web app has not opened since the payload move still keeps payload_json on payroll_weeks.
+PAYLOAD_TABLE_SQL = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'payroll_week_payloads'"
+PAYLOAD_SOURCES = {
+    True: {"payload": "p.payload_json", "join": "JOIN payroll_week_payloads p ON p.week_id = w.id"},
+    False: {"payload": "w.payload_json", "join": ""},
+}
+
+
 def query_period(
     con: sqlite3.Connection,
     *,
@@ -44,52 +92,23 @@ def query_period(
     week_start: str | None,
     week_end: str | None,
     user_id: int | None,
-) -> tuple[str, str, str]:
+) -> tuple[str, str, bytes]:
     con.row_factory = sqlite3.Row
+    source = PAYLOAD_SOURCES[con.execute(PAYLOAD_TABLE_SQL).fetchone() is not None]
 
     if latest:
-        clauses = []
-        values: list[object] = []
-        if user_id is not None:
-            clauses.append("user_id = ?")
-            values.append(user_id)
-        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-        row = con.execute(
-            f"""
-            SELECT week_start, week_end, payload_json
-            FROM payroll_weeks
-            {where}
-            ORDER BY updated_at DESC, id DESC
-            LIMIT 1
-            """,
-            values,
-        ).fetchone()
+        row = con.execute(LATEST_PERIOD_SQL.format(**source), {"user_id": user_id}).fetchone()
     else:
         if not week_start:
             raise SystemExit("Error: provide --week-start or use --latest")
-        clauses = ["week_start = ?"]
-        values = [week_start]
-        if week_end:
-            clauses.append("week_end = ?")
-            values.append(week_end)
-        if user_id is not None:
-            clauses.append("user_id = ?")
-            values.append(user_id)
-        where = " AND ".join(clauses)
         row = con.execute(
-            f"""
-            SELECT week_start, week_end, payload_json
-            FROM payroll_weeks
-            WHERE {where}
-            ORDER BY updated_at DESC, id DESC
-            LIMIT 1
-            """,
-            values,
+            WEEK_PERIOD_SQL.format(**source),
+            {"week_start": week_start, "week_end": week_end or None, "user_id": user_id},
         ).fetchone()
 
     if row is None:
         raise SystemExit("Error: matching payroll week not found")
-    return str(row["week_start"]), str(row["week_end"]), str(row["payload_json"])
+    return str(row["week_start"]), str(row["week_end"]), bytes(row["payload_json"] or b"")
 
 
 def main() -> None:
@@ -99,6 +118,8 @@ def main() -> None:
         raise SystemExit(f"Error: DB not found: {db_path}")
 
     with sqlite3.connect(db_path) as con:
+        for pragma in READ_PRAGMAS:
+            con.execute(pragma)
         week_start, week_end, payload_json = query_period(
             con,
             latest=bool(args.latest),
@@ -107,11 +128,21 @@ def main() -> None:
             user_id=args.user_id,
         )
 
-    payload = json.loads(payload_json)
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / f"{week_start}_{week_end}.json"
-    out_path.write_text(json.dumps(payload, ensure_ascii=True, separators=(",", ":")) + "\n", encoding="utf-8")
+    if args.raw or payload_json.isascii():
+        # The app stores compact JSON, so an ASCII-only payload already is the export format and is written
+        # without a parse/re-encode; --raw passes non-ASCII payloads through unescaped as well.
+        with out_path.open("wb", buffering=0) as handle:
+            handle.write(payload_json)
+            if not payload_json.endswith(b"\n"):
+                handle.write(b"\n")
+        print(str(out_path))
+        return
+
+    payload = orjson.loads(payload_json) if orjson is not None else json.loads(payload_json)
+    out_path.write_bytes((json.dumps(payload, ensure_ascii=True, separators=(",", ":")) + "\n").encode("ascii"))
     print(str(out_path))
 
 
@@ -4,15 +4,27 @@
 from __future__ import annotations
 
 import argparse
+import http.client
 import json
 import os
 import sqlite3
 import sys
+import threading
+from http.cookies import SimpleCookie
 from pathlib import Path
 from typing import Any
-from urllib import request
-from urllib.error import HTTPError, URLError
-import http.cookiejar
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(raw: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def parse_args() -> argparse.Namespace:
@@ -36,6 +48,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-weeks", type=int, default=0, help="Optional max number of weeks to sync")
     parser.add_argument("--dry-run", action="store_true", help="Print weeks that would sync without writing remote")
     parser.add_argument("--timeout", type=float, default=30.0, help="HTTP timeout seconds")
+    parser.add_argument("--batch-size", type=int, default=25, help="Weeks sent per bulk save request")
     return parser.parse_args()
 
 
@@ -43,6 +56,36 @@ def normalize_base_url(url: str) -> str:
     return str(url or "").strip().rstrip("/")
 
 
+# Same read-side tuning as export_payroll_period.py; the journal mode is left to the web app.
+READ_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+JSON_HEADERS = {"Accept": "application/json", "Content-Type": "application/json"}
+ACCEPT_JSON_HEADERS = {"Accept": "application/json"}
+
+# One static statement for every filter combination: a NULL user_id matches all users, "" matches every
+# week_start and LIMIT -1 means no limit, so SQLite can reuse the prepared statement.
+READ_LOCAL_WEEKS_SQL = """
+    SELECT w.week_start, w.week_end, w.pay_period, w.period_note, CAST({payload} AS BLOB)
+    FROM payroll_weeks w
+    {join}
+    WHERE (:user_id IS NULL OR w.user_id = :user_id) AND w.week_start >= :since_week_start
+    ORDER BY w.week_start ASC, w.updated_at ASC
+    LIMIT :limit
+"""
+
+# Payloads live in payroll_week_payloads once the web app has migrated the database; before that they are
+# still inline on payroll_weeks.
+PAYLOAD_TABLE_SQL = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'payroll_week_payloads'"
+PAYLOAD_SOURCES = {
+    True: {"payload": "p.payload_json", "join": "LEFT JOIN payroll_week_payloads p ON p.week_id = w.id"},
+    False: {"payload": "w.payload_json", "join": ""},
+}
+
+
 def read_local_weeks(
     db_path: Path,
     *,
@@ -53,43 +96,30 @@ def read_local_weeks(
     if not db_path.exists():
         raise SystemExit(f"DB not found: {db_path}")
 
-    clauses: list[str] = []
-    values: list[Any] = []
-    if local_user_id is not None:
-        clauses.append("user_id = ?")
-        values.append(local_user_id)
-    if since_week_start:
-        clauses.append("week_start >= ?")
-        values.append(since_week_start)
-
-    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-    limit_sql = "LIMIT ?" if max_weeks > 0 else ""
-    if max_weeks > 0:
-        values.append(max_weeks)
-
-    query = f"""
-        SELECT week_start, week_end, pay_period, period_note, payload_json
-        FROM payroll_weeks
-        {where_sql}
-        ORDER BY week_start ASC, updated_at ASC
-        {limit_sql}
-    """
+    values = {
+        "user_id": local_user_id,
+        "since_week_start": since_week_start or "",
+        "limit": max_weeks if max_weeks > 0 else -1,
+    }
 
     out: list[dict[str, Any]] = []
     with sqlite3.connect(db_path) as con:
-        con.row_factory = sqlite3.Row
-        for row in con.execute(query, values).fetchall():
+        for pragma in READ_PRAGMAS:
+            con.execute(pragma)
+        source = PAYLOAD_SOURCES[con.execute(PAYLOAD_TABLE_SQL).fetchone() is not None]
+        rows = con.execute(READ_LOCAL_WEEKS_SQL.format(**source), values)
+        for row_start, row_end, row_period, row_note, payload_json in rows:
             try:
-                payload = json.loads(str(row["payload_json"] or "{}"))
+                payload = json_loads(payload_json or b"{}")
             except Exception:
                 payload = {}
             if not isinstance(payload, dict):
                 payload = {}
 
-            week_start = str(payload.get("week_start") or row["week_start"] or "").strip()
-            week_end = str(payload.get("week_end") or row["week_end"] or "").strip()
-            pay_period = str(payload.get("pay_period") or row["pay_period"] or "").strip()
-            period_note = str(payload.get("period_note") or row["period_note"] or "")
+            week_start = str(payload.get("week_start") or row_start or "").strip()
+            week_end = str(payload.get("week_end") or row_end or "").strip()
+            pay_period = str(payload.get("pay_period") or row_period or "").strip()
+            period_note = str(payload.get("period_note") or row_note or "")
             employees = payload.get("employees")
             if not isinstance(employees, list):
                 employees = []
@@ -109,60 +139,114 @@ def read_local_weeks(
     return out
 
 
+class RemoteSession:
+    # Keeps one persistent HTTP(S) connection per thread plus the login cookie, so every request after the
+    # first reuses its TCP/TLS connection instead of reconnecting the way urllib does.
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.cookies = SimpleCookie()
+        self.cookie_header = ""
+        self.cookies_lock = threading.Lock()
+        self.local = threading.local()
+
+    def connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        connections = self.local.__dict__.setdefault("connections", {})
+        con = connections.get((scheme, netloc))
+        if con is None:
+            if scheme == "https":
+                con = http.client.HTTPSConnection(netloc, timeout=self.timeout)
+            elif scheme == "http":
+                con = http.client.HTTPConnection(netloc, timeout=self.timeout)
+            else:
+                raise SystemExit(f"Unsupported URL scheme: {scheme}")
+            connections[(scheme, netloc)] = con
+        return con
+
+    def drop(self, scheme: str, netloc: str) -> None:
+        con = self.local.__dict__.get("connections", {}).pop((scheme, netloc), None)
+        if con is not None:
+            con.close()
+
+    def request(self, method: str, url: str, body: bytes | None, headers: dict[str, str]) -> tuple[int, bytes]:
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        cookie_header = self.cookie_header
+        if cookie_header:
+            headers = {**headers, "Cookie": cookie_header}
+
+        for attempt in range(2):
+            con = self.connection(parts.scheme, parts.netloc)
+            reused = con.sock is not None
+            try:
+                con.request(method, path, body=body, headers=headers)
+                resp = con.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.drop(parts.scheme, parts.netloc)
+                if reused and attempt == 0:
+                    # The server closed an idle keep-alive connection; saves are upserts, so resend once.
+                    continue
+                raise
+            except BaseException:
+                self.drop(parts.scheme, parts.netloc)
+                raise
+            if resp.will_close:
+                self.drop(parts.scheme, parts.netloc)
+            set_cookies = resp.headers.get_all("Set-Cookie")
+            if set_cookies:
+                with self.cookies_lock:
+                    for header in set_cookies:
+                        self.cookies.load(header)
+                    self.cookie_header = "; ".join(f"{name}={morsel.value}" for name, morsel in self.cookies.items())
+            return resp.status, data
+        raise ConnectionError(f"Connection to {parts.netloc} kept closing")
+
+
 def json_request(
-    opener: request.OpenerDirector,
+    session: RemoteSession,
     *,
     method: str,
     url: str,
     payload: dict[str, Any] | None,
-    timeout: float,
 ) -> tuple[int, dict[str, Any]]:
     body = None
-    headers = {"Accept": "application/json"}
+    headers = ACCEPT_JSON_HEADERS
     if payload is not None:
-        body = json.dumps(payload).encode("utf-8")
-        headers["Content-Type"] = "application/json"
-    req = request.Request(url=url, data=body, headers=headers, method=method)
+        body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8")
+        headers = JSON_HEADERS
     try:
-        with opener.open(req, timeout=timeout) as resp:
-            status = int(resp.status)
-            data_raw = resp.read().decode("utf-8", errors="replace")
-    except HTTPError as exc:
-        status = int(exc.code)
-        data_raw = exc.read().decode("utf-8", errors="replace")
-    except URLError as exc:
+        status, data_raw = session.request(method, url, body, headers)
+    except (OSError, http.client.HTTPException) as exc:
         raise SystemExit(f"Network error calling {url}: {exc}") from exc
 
     try:
-        payload_out = json.loads(data_raw) if data_raw else {}
+        payload_out = json_loads(data_raw) if data_raw else {}
     except Exception:
-        payload_out = {"raw": data_raw}
+        payload_out = {"raw": data_raw.decode("utf-8", errors="replace")}
     return status, payload_out if isinstance(payload_out, dict) else {"raw": payload_out}
 
 
 def login_remote(
-    opener: request.OpenerDirector, *, base_url: str, email: str, password: str, timeout: float
+    session: RemoteSession, *, base_url: str, email: str, password: str
 ) -> None:
     status, payload = json_request(
-        opener,
+        session,
         method="POST",
         url=f"{base_url}/api/auth/login",
         payload={"email": email, "password": password},
-        timeout=timeout,
     )
     if status != 200 or not payload.get("ok"):
         raise SystemExit(f"Remote login failed ({status}): {payload.get('error') or payload}")
 
 
 def save_week_remote(
-    opener: request.OpenerDirector, *, base_url: str, week_payload: dict[str, Any], timeout: float
+    session: RemoteSession, *, base_url: str, week_payload: dict[str, Any]
 ) -> tuple[bool, str]:
     status, payload = json_request(
-        opener,
+        session,
         method="POST",
         url=f"{base_url}/api/workspace/save",
         payload=week_payload,
-        timeout=timeout,
     )
     if status != 200 or not payload.get("ok"):
         return False, str(payload.get("error") or payload)
@@ -170,6 +254,34 @@ def save_week_remote(
     return True, f"period_id={period_id}"
 
 
+def save_weeks_bulk_remote(
+    session: RemoteSession,
+    *,
+    base_url: str,
+    weeks: list[dict[str, Any]],
+) -> list[tuple[bool, str]] | None:
+    status, payload = json_request(
+        session,
+        method="POST",
+        url=f"{base_url}/api/workspace/save_bulk",
+        payload={"weeks": weeks},
+    )
+    if status == 404:
+        # Older deployments have no bulk endpoint; the caller falls back to one request per week.
+        return None
+    results = payload.get("results")
+    if status != 200 or not payload.get("ok") or not isinstance(results, list) or len(results) != len(weeks):
+        detail = str(payload.get("error") or payload)
+        return [(False, detail) for _ in weeks]
+    out: list[tuple[bool, str]] = []
+    for item in results:
+        if isinstance(item, dict) and item.get("ok"):
+            out.append((True, f"period_id={item.get('period_id')}"))
+        else:
+            out.append((False, str(item.get("error") if isinstance(item, dict) else item)))
+    return out
+
+
 def main() -> None:
     args = parse_args()
     base_url = normalize_base_url(args.base_url)
@@ -194,14 +306,26 @@ def main() -> None:
             print(f"would sync {entry['week_start']} -> {entry['week_end']} ({len(entry['employees'])} employees)")
         return
 
-    cookie_jar = http.cookiejar.CookieJar()
-    opener = request.build_opener(request.HTTPCookieProcessor(cookie_jar))
-    login_remote(opener, base_url=base_url, email=args.email, password=args.password, timeout=args.timeout)
+    session = RemoteSession(timeout=args.timeout)
+    login_remote(session, base_url=base_url, email=args.email, password=args.password)
+
+    batch_size = max(1, int(args.batch_size or 1))
+    outcomes: list[tuple[bool, str]] = []
+    # Batches go one at a time in week_start order: every save also upserts the roster, so the newest week
+    # has to be written last for its rates to win.
+    for start in range(0, len(weeks), batch_size):
+        batch = weeks[start : start + batch_size]
+        batch_outcomes = save_weeks_bulk_remote(session, base_url=base_url, weeks=batch)
+        if batch_outcomes is None:
+            batch_outcomes = [
+                save_week_remote(session, base_url=base_url, week_payload=entry)
+                for entry in batch
+            ]
+        outcomes.extend(batch_outcomes)
 
     ok_count = 0
     fail_count = 0
-    for entry in weeks:
-        ok, detail = save_week_remote(opener, base_url=base_url, week_payload=entry, timeout=args.timeout)
+    for entry, (ok, detail) in zip(weeks, outcomes):
         if ok:
             ok_count += 1
             print(f"synced {entry['week_start']} -> {entry['week_end']} ({detail})")
@@ -8,6 +8,7 @@ import csv
 import re
 from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 EXPECTED_COLUMNS = 19
@@ -62,6 +63,7 @@ def parse_hhmm_to_minutes(value: str) -> int | None:
     return sign * (int(hours) * 60 + int(minutes))
 
 
+@lru_cache(maxsize=4096)
 def parse_clock_to_minutes(value: str) -> int | None:
     text = clean(value).upper()
     if not TIME_PATTERN.fullmatch(text):
@@ -135,9 +137,7 @@ def flatten_timecard(
                 continue
 
             key = (current_employee, department)
-            if key not in totals:
-                totals[key] = 0
-            totals[key] += minutes
+            totals[key] = totals.get(key, 0) + minutes
 
     return totals
 
@@ -151,12 +151,15 @@ def build_output_path(
     return input_path.with_name(f"{input_path.stem}{suffix}")
 
 
-def write_flat_csv(output_path: Path, totals: OrderedDict[tuple[str, str], int]) -> None:
+def write_flat_csv(output_path: Path, totals: OrderedDict[tuple[str, str], int]) -> list[str]:
+    names: dict[str, None] = {}
     with output_path.open("w", newline="", encoding="utf-8") as handle:
         writer = csv.writer(handle)
         writer.writerow(["Name", "Company", "Hours at Company"])
         for (name, company), minutes in totals.items():
+            names[name] = None
             writer.writerow([name, company, format_minutes_as_hhmm(minutes)])
+    return list(names)
 
 
 def parse_args() -> argparse.Namespace:
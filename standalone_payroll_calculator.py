@@ -13,12 +13,24 @@ import unicodedata
 import zipfile
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import BinaryIO, Iterator
 from xml.etree import ElementTree as ET
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
-NS = {"a": NS_MAIN}
+# Clark-notation tags hit ElementTree's C fast path; "a:..." prefixes go through ElementPath on every call.
+SHARED_STRING_TAG = f"{{{NS_MAIN}}}si"
+TEXT_TAG = f"{{{NS_MAIN}}}t"
+SHEET_DATA_TAG = f"{{{NS_MAIN}}}sheetData"
+ROW_TAG = f"{{{NS_MAIN}}}row"
+CELL_TAG = f"{{{NS_MAIN}}}c"
+VALUE_TAG = f"{{{NS_MAIN}}}v"
 CELL_REF_RE = re.compile(r"([A-Z]+)(\d+)")
 
 HOME_COMPANIES = (
@@ -36,6 +48,7 @@ HOME_COMPANY_LABEL = {
 }
 
 BILLED_COMPANIES = ("scanio", "sea_and_air", "flat_price")
+BILLED_COMPANY_INDEX = {company: index for index, company in enumerate(BILLED_COMPANIES)}
 
 BILLED_COMPANY_LABEL = {
     "scanio": "SCANIO",
@@ -50,6 +63,36 @@ DEFAULT_BURDEN = {
     "flat_price": 1.18,
 }
 
+DETAILS_HEADER_LINE = ",".join(
+    (
+        "Name",
+        "Home Company",
+        "Rate",
+        "Scanio Hours",
+        "Sea and Air Hours",
+        "Flat Price Hours",
+        "Total Hours",
+        "Regular Hours",
+        "Overtime Hours",
+        "Base Pay",
+        "Overtime Premium",
+        "Total Pay",
+        "Scanio %",
+        "Sea and Air %",
+        "Flat Price %",
+        "Alloc Pay -> Scanio",
+        "Alloc Pay -> Sea and Air",
+        "Alloc Pay -> Flat Price",
+        "Burden Multiplier",
+        "Alloc Cost -> Scanio",
+        "Alloc Cost -> Sea and Air",
+        "Alloc Cost -> Flat Price",
+    )
+)
+
+FUZZY_MATCH_MIN_SCORE = 0.78
+FUZZY_MATCH_MARGIN = 0.03
+
 
 @dataclass
 class EmployeeConfig:
@@ -59,18 +102,53 @@ class EmployeeConfig:
     burden_multiplier: float
 
 
+@dataclass(slots=True)
+class CalcRow:
+    name: str
+    source_name: str
+    home_company: str
+    rate: float
+    scanio_hours: float
+    sea_and_air_hours: float
+    flat_price_hours: float
+    total_hours: float
+    regular_hours: float
+    overtime_hours: float
+    base_pay: float
+    overtime_premium: float
+    total_pay: float
+    scanio_pct: float
+    sea_and_air_pct: float
+    flat_price_pct: float
+    alloc_pay_scanio: float
+    alloc_pay_sea_and_air: float
+    alloc_pay_flat_price: float
+    burden_multiplier: float
+    alloc_cost_scanio: float
+    alloc_cost_sea_and_air: float
+    alloc_cost_flat_price: float
+
+
 def normalize_spaces(value: str) -> str:
     return " ".join((value or "").strip().split())
 
 
+# Maps each ASCII character to its lowercase form if alphanumeric, otherwise to a space.
+NORMALIZE_TEXT_TABLE = str.maketrans(
+    {chr(code): (chr(code).lower() if chr(code).isalnum() else " ") for code in range(128)}
+)
+
+
+# Company labels and roster names repeat across every CSV row and matching pass.
+@lru_cache(maxsize=4096)
 def normalize_text(value: str) -> str:
-    text = unicodedata.normalize("NFKD", value or "")
-    text = text.encode("ascii", "ignore").decode("ascii")
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9 ]+", " ", text)
-    return " ".join(token for token in text.split() if token)
+    text = value or ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return " ".join(text.translate(NORMALIZE_TEXT_TABLE).split())
 
 
+@lru_cache(maxsize=4096)
 def first_last(normalized_name: str) -> tuple[str, str]:
     tokens = normalized_name.split()
     if not tokens:
@@ -85,27 +163,42 @@ def parse_cell_ref(cell_ref: str) -> tuple[str, int]:
     return match.group(1), int(match.group(2))
 
 
+def iter_xml_elements(stream: BinaryIO, tags: set[str]) -> Iterator[ET.Element]:
+    # Yields each matching element once it is fully parsed, then detaches it from its parent so
+    # memory stays at one element instead of the whole document tree.
+    open_elements: list[ET.Element] = []
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            open_elements.append(elem)
+            continue
+        open_elements.pop()
+        if elem.tag in tags:
+            yield elem
+            if open_elements:
+                del open_elements[-1][:]
+
+
 def get_shared_strings(zf: zipfile.ZipFile) -> list[str]:
-    root = ET.fromstring(zf.read("xl/sharedStrings.xml"))
     strings: list[str] = []
-    for item in root.findall("a:si", NS):
-        text = "".join(node.text or "" for node in item.findall(".//a:t", NS))
-        strings.append(text)
+    with zf.open("xl/sharedStrings.xml") as stream:
+        for item in iter_xml_elements(stream, {SHARED_STRING_TAG}):
+            text = "".join(node.text or "" for node in item.iter(TEXT_TAG))
+            strings.append(text)
     return strings
 
 
 def get_row_cells(row_elem: ET.Element) -> dict[str, ET.Element]:
     cells: dict[str, ET.Element] = {}
-    for cell in row_elem.findall("a:c", NS):
-        col, _ = parse_cell_ref(cell.attrib["r"])
-        cells[col] = cell
+    for cell in row_elem.iter(CELL_TAG):
+        # Only the column is needed; Excel writes refs as uppercase letters followed by the row number.
+        cells[cell.attrib["r"].rstrip("0123456789")] = cell
     return cells
 
 
 def get_string_cell_value(cell: ET.Element | None, shared_strings: list[str]) -> str | None:
     if cell is None or cell.attrib.get("t") != "s":
         return None
-    value_node = cell.find("a:v", NS)
+    value_node = cell.find(VALUE_TAG)
     if value_node is None or value_node.text is None:
         return None
     return shared_strings[int(value_node.text)]
@@ -114,7 +207,7 @@ def get_string_cell_value(cell: ET.Element | None, shared_strings: list[str]) ->
 def get_numeric_cell_value(cell: ET.Element | None) -> float | None:
     if cell is None:
         return None
-    value_node = cell.find("a:v", NS)
+    value_node = cell.find(VALUE_TAG)
     if value_node is None or value_node.text is None:
         return None
     try:
@@ -152,7 +245,7 @@ def parse_billed_company(label: str) -> str | None:
 
 
 def parse_hour_text_to_decimal(value: str) -> float:
-    text = normalize_spaces(value).replace(" ", "")
+    text = "".join((value or "").split())
     if not text:
         return 0.0
 
@@ -162,15 +255,9 @@ def parse_hour_text_to_decimal(value: str) -> float:
             sign = -1.0
         text = text[1:]
 
-    if ":" in text:
-        hour_part, minute_part = text.split(":", 1)
-        if hour_part == "":
-            hour_part = "0"
-        if minute_part == "":
-            minute_part = "0"
-        hours = int(hour_part)
-        minutes = int(minute_part)
-        return sign * (hours + minutes / 60.0)
+    hour_part, has_minutes, minute_part = text.partition(":")
+    if has_minutes:
+        return sign * (int(hour_part or "0") + int(minute_part or "0") / 60.0)
 
     return sign * float(text)
 
@@ -180,50 +267,59 @@ def format_decimal(value: float) -> str:
     return text if text else "0"
 
 
-def seed_roster_from_workbook(workbook_path: Path) -> list[EmployeeConfig]:
-    with zipfile.ZipFile(workbook_path, "r") as zf:
-        shared_strings = get_shared_strings(zf)
-        sheet = ET.fromstring(zf.read("xl/worksheets/sheet1.xml"))
+def csv_text_field(value: str) -> str:
+    if "," in value or '"' in value or "\n" in value or "\r" in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
 
-    sheet_data = sheet.find("a:sheetData", NS)
-    if sheet_data is None:
-        raise ValueError("Could not find sheet data in workbook.")
 
+def seed_roster_from_workbook(workbook_path: Path) -> list[EmployeeConfig]:
     roster: list[EmployeeConfig] = []
     current_home_company: str | None = None
+    found_sheet_data = False
 
-    for row_elem in sheet_data.findall("a:row", NS):
-        cells = get_row_cells(row_elem)
-        label = get_string_cell_value(cells.get("B"), shared_strings)
+    with zipfile.ZipFile(workbook_path, "r") as zf:
+        shared_strings = get_shared_strings(zf)
+        with zf.open("xl/worksheets/sheet1.xml") as stream:
+            for row_elem in iter_xml_elements(stream, {ROW_TAG, SHEET_DATA_TAG}):
+                if row_elem.tag == SHEET_DATA_TAG:
+                    found_sheet_data = True
+                    continue
+
+                cells = get_row_cells(row_elem)
+                label = get_string_cell_value(cells.get("B"), shared_strings)
+
+                if label:
+                    home = parse_home_company(label)
+                    if home:
+                        current_home_company = home
+                        continue
 
-        if label:
-            home = parse_home_company(label)
-            if home:
-                current_home_company = home
-                continue
+                    if normalize_text(label) == "total":
+                        current_home_company = None
+                        continue
 
-            if normalize_text(label) == "total":
-                current_home_company = None
-                continue
+                if current_home_company is None:
+                    continue
 
-        if current_home_company is None:
-            continue
+                if not label:
+                    continue
 
-        if not label:
-            continue
+                rate = get_numeric_cell_value(cells.get("C"))
+                if rate is None:
+                    continue
 
-        rate = get_numeric_cell_value(cells.get("C"))
-        if rate is None:
-            continue
+                roster.append(
+                    EmployeeConfig(
+                        name=normalize_spaces(label),
+                        home_company=current_home_company,
+                        rate=float(rate),
+                        burden_multiplier=DEFAULT_BURDEN[current_home_company],
+                    )
+                )
 
-        roster.append(
-            EmployeeConfig(
-                name=normalize_spaces(label),
-                home_company=current_home_company,
-                rate=float(rate),
-                burden_multiplier=DEFAULT_BURDEN[current_home_company],
-            )
-        )
+    if not found_sheet_data:
+        raise ValueError("Could not find sheet data in workbook.")
 
     deduped: dict[str, EmployeeConfig] = {}
     for entry in roster:
@@ -248,7 +344,10 @@ def write_roster(roster_path: Path, roster: list[EmployeeConfig]) -> None:
 
 
 def read_roster(roster_path: Path) -> list[EmployeeConfig]:
-    data = json.loads(roster_path.read_text(encoding="utf-8"))
+    if orjson is not None:
+        data = orjson.loads(roster_path.read_bytes())
+    else:
+        data = json.loads(roster_path.read_text(encoding="utf-8"))
     employees = data.get("employees", [])
     roster: list[EmployeeConfig] = []
     for item in employees:
@@ -282,31 +381,47 @@ def ensure_roster(
     return roster
 
 
-def read_hours_csv(hours_csv_path: Path) -> tuple[dict[str, dict[str, float]], list[str]]:
-    by_name: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+def read_hours_csv(hours_csv_path: Path) -> tuple[dict[str, list[float]], list[str]]:
+    # Hours per source name, one slot per BILLED_COMPANIES entry.
+    by_name: dict[str, list[float]] = {}
     unknown_companies: list[str] = []
 
     with hours_csv_path.open(newline="", encoding="utf-8-sig") as handle:
-        reader = csv.DictReader(handle)
+        reader = csv.reader(handle)
+        # Later duplicates win, as they did with DictReader.
+        column_index = {field: index for index, field in enumerate(next(reader, []))}
         required = {"Name", "Company", "Hours at Company"}
-        missing = required - set(reader.fieldnames or [])
+        missing = required - column_index.keys()
         if missing:
             raise ValueError(f"Hours CSV missing columns: {sorted(missing)}")
 
+        name_index = column_index["Name"]
+        company_index = column_index["Company"]
+        hours_index = column_index["Hours at Company"]
+        width = max(name_index, company_index, hours_index) + 1
+
         for row in reader:
-            name = normalize_spaces(row["Name"])
+            if len(row) < width:
+                if not row:
+                    continue
+                row += [""] * (width - len(row))
+
+            name = normalize_spaces(row[name_index])
             if not name:
                 continue
 
-            billed_company = parse_billed_company(row["Company"])
+            billed_company = parse_billed_company(row[company_index])
             if billed_company is None:
-                company = normalize_spaces(row["Company"])
+                company = normalize_spaces(row[company_index])
                 if company and company not in unknown_companies:
                     unknown_companies.append(company)
                 continue
 
-            hours = parse_hour_text_to_decimal(row["Hours at Company"])
-            by_name[name][billed_company] += hours
+            hours = parse_hour_text_to_decimal(row[hours_index])
+            buckets = by_name.get(name)
+            if buckets is None:
+                buckets = by_name[name] = [0.0, 0.0, 0.0]
+            buckets[BILLED_COMPANY_INDEX[billed_company]] += hours
 
     return by_name, unknown_companies
 
@@ -314,13 +429,18 @@ def read_hours_csv(hours_csv_path: Path) -> tuple[dict[str, dict[str, float]], l
 def map_source_to_roster(
     source_names: list[str], roster: list[EmployeeConfig]
 ) -> tuple[dict[str, EmployeeConfig], list[str]]:
-    roster_by_exact: dict[str, list[EmployeeConfig]] = defaultdict(list)
-    roster_by_first_last: dict[tuple[str, str], list[EmployeeConfig]] = defaultdict(list)
+    roster_keys: list[tuple[str, str, str, difflib.SequenceMatcher, EmployeeConfig]] = []
+    roster_by_exact: dict[str, list[tuple[str, EmployeeConfig]]] = defaultdict(list)
+    roster_by_first_last: dict[tuple[str, str], list[tuple[str, EmployeeConfig]]] = defaultdict(list)
 
     for entry in roster:
         normalized = normalize_text(entry.name)
-        roster_by_exact[normalized].append(entry)
-        roster_by_first_last[first_last(normalized)].append(entry)
+        entry_first, entry_last = first_last(normalized)
+        # SequenceMatcher indexes its second sequence; do that once per roster name, not per pair.
+        matcher = difflib.SequenceMatcher(None, "", normalized)
+        roster_keys.append((normalized, entry_first, entry_last, matcher, entry))
+        roster_by_exact[normalized].append((normalized, entry))
+        roster_by_first_last[(entry_first, entry_last)].append((normalized, entry))
 
     used: set[str] = set()
     mapped: dict[str, EmployeeConfig] = {}
@@ -329,57 +449,57 @@ def map_source_to_roster(
     for source_name in source_names:
         normalized_source = normalize_text(source_name)
         candidates = [
-            item
-            for item in roster_by_exact.get(normalized_source, [])
-            if normalize_text(item.name) not in used
+            item for item in roster_by_exact.get(normalized_source, []) if item[0] not in used
         ]
 
-        chosen: EmployeeConfig | None = None
+        chosen: tuple[str, EmployeeConfig] | None = None
         if len(candidates) == 1:
             chosen = candidates[0]
         else:
             fl = first_last(normalized_source)
             fl_candidates = [
-                item
-                for item in roster_by_first_last.get(fl, [])
-                if normalize_text(item.name) not in used
+                item for item in roster_by_first_last.get(fl, []) if item[0] not in used
             ]
             if len(fl_candidates) == 1:
                 chosen = fl_candidates[0]
             else:
-                scored: list[tuple[float, EmployeeConfig]] = []
-                source_tokens = normalized_source.split()
-                source_first = source_tokens[0] if source_tokens else ""
-                source_last = source_tokens[-1] if source_tokens else ""
+                scored: list[tuple[float, tuple[str, EmployeeConfig]]] = []
+                source_first, source_last = fl
+                # An entry scoring below floor can neither be chosen nor come within the margin
+                # of the choice, so skip it once quick_ratio's upper bound rules it out.
+                floor = FUZZY_MATCH_MIN_SCORE - FUZZY_MATCH_MARGIN - 1e-9
 
-                for entry in roster:
-                    key = normalize_text(entry.name)
+                for key, entry_first, entry_last, matcher, entry in roster_keys:
                     if key in used:
                         continue
-                    entry_norm = normalize_text(entry.name)
-                    entry_tokens = entry_norm.split()
-                    entry_first = entry_tokens[0] if entry_tokens else ""
-                    entry_last = entry_tokens[-1] if entry_tokens else ""
-                    score = difflib.SequenceMatcher(None, normalized_source, entry_norm).ratio()
-                    if source_last and source_last == entry_last:
-                        score += 0.08
-                    if source_first and source_first == entry_first:
-                        score += 0.05
-                    scored.append((score, entry))
+                    last_bonus = 0.08 if source_last and source_last == entry_last else 0.0
+                    first_bonus = 0.05 if source_first and source_first == entry_first else 0.0
+                    matcher.set_seq1(normalized_source)
+                    if (
+                        matcher.real_quick_ratio() + last_bonus + first_bonus < floor
+                        or matcher.quick_ratio() + last_bonus + first_bonus < floor
+                    ):
+                        continue
+                    score = matcher.ratio() + last_bonus + first_bonus
+                    scored.append((score, (key, entry)))
+                    floor = max(floor, score - FUZZY_MATCH_MARGIN - 1e-9)
 
                 scored.sort(key=lambda pair: pair[0], reverse=True)
                 if scored:
                     best_score, best_entry = scored[0]
                     second_score = scored[1][0] if len(scored) > 1 else 0.0
-                    if best_score >= 0.78 and (best_score - second_score >= 0.03):
+                    if best_score >= FUZZY_MATCH_MIN_SCORE and (
+                        best_score - second_score >= FUZZY_MATCH_MARGIN
+                    ):
                         chosen = best_entry
 
         if chosen is None:
             unmatched.append(source_name)
             continue
 
-        mapped[source_name] = chosen
-        used.add(normalize_text(chosen.name))
+        chosen_key, chosen_entry = chosen
+        mapped[source_name] = chosen_entry
+        used.add(chosen_key)
 
     return mapped, unmatched
 
@@ -458,16 +578,14 @@ def resolve_unknown_names(
 
 
 def build_calculation_rows(
-    source_hours_by_name: dict[str, dict[str, float]],
+    source_hours_by_name: dict[str, list[float]],
     source_to_employee: dict[str, EmployeeConfig],
-) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
+) -> list[CalcRow]:
+    rows: list[CalcRow] = []
 
     for source_name, buckets in source_hours_by_name.items():
         employee = source_to_employee[source_name]
-        scanio_hours = float(buckets.get("scanio", 0.0))
-        sea_and_air_hours = float(buckets.get("sea_and_air", 0.0))
-        flat_price_hours = float(buckets.get("flat_price", 0.0))
+        scanio_hours, sea_and_air_hours, flat_price_hours = buckets
         total_hours = scanio_hours + sea_and_air_hours + flat_price_hours
 
         regular_hours = min(total_hours, 40.0)
@@ -496,109 +614,93 @@ def build_calculation_rows(
         alloc_cost_flat_price = alloc_pay_flat_price * burden
 
         rows.append(
-            {
-                "name": employee.name,
-                "source_name": source_name,
-                "home_company": employee.home_company,
-                "rate": employee.rate,
-                "scanio_hours": scanio_hours,
-                "sea_and_air_hours": sea_and_air_hours,
-                "flat_price_hours": flat_price_hours,
-                "total_hours": total_hours,
-                "regular_hours": regular_hours,
-                "overtime_hours": overtime_hours,
-                "base_pay": base_pay,
-                "overtime_premium": overtime_premium,
-                "total_pay": total_pay,
-                "scanio_pct": scanio_pct,
-                "sea_and_air_pct": sea_and_air_pct,
-                "flat_price_pct": flat_price_pct,
-                "alloc_pay_scanio": alloc_pay_scanio,
-                "alloc_pay_sea_and_air": alloc_pay_sea_and_air,
-                "alloc_pay_flat_price": alloc_pay_flat_price,
-                "burden_multiplier": burden,
-                "alloc_cost_scanio": alloc_cost_scanio,
-                "alloc_cost_sea_and_air": alloc_cost_sea_and_air,
-                "alloc_cost_flat_price": alloc_cost_flat_price,
-            }
+            CalcRow(
+                name=employee.name,
+                source_name=source_name,
+                home_company=employee.home_company,
+                rate=employee.rate,
+                scanio_hours=scanio_hours,
+                sea_and_air_hours=sea_and_air_hours,
+                flat_price_hours=flat_price_hours,
+                total_hours=total_hours,
+                regular_hours=regular_hours,
+                overtime_hours=overtime_hours,
+                base_pay=base_pay,
+                overtime_premium=overtime_premium,
+                total_pay=total_pay,
+                scanio_pct=scanio_pct,
+                sea_and_air_pct=sea_and_air_pct,
+                flat_price_pct=flat_price_pct,
+                alloc_pay_scanio=alloc_pay_scanio,
+                alloc_pay_sea_and_air=alloc_pay_sea_and_air,
+                alloc_pay_flat_price=alloc_pay_flat_price,
+                burden_multiplier=burden,
+                alloc_cost_scanio=alloc_cost_scanio,
+                alloc_cost_sea_and_air=alloc_cost_sea_and_air,
+                alloc_cost_flat_price=alloc_cost_flat_price,
+            )
         )
 
-    rows.sort(key=lambda row: (HOME_COMPANY_LABEL[row["home_company"]], row["name"].lower()))
+    rows.sort(key=lambda row: (HOME_COMPANY_LABEL[row.home_company], row.name.lower()))
     return rows
 
 
-def write_details_csv(path: Path, rows: list[dict[str, Any]]) -> None:
-    header = [
-        "Name",
-        "Home Company",
-        "Rate",
-        "Scanio Hours",
-        "Sea and Air Hours",
-        "Flat Price Hours",
-        "Total Hours",
-        "Regular Hours",
-        "Overtime Hours",
-        "Base Pay",
-        "Overtime Premium",
-        "Total Pay",
-        "Scanio %",
-        "Sea and Air %",
-        "Flat Price %",
-        "Alloc Pay -> Scanio",
-        "Alloc Pay -> Sea and Air",
-        "Alloc Pay -> Flat Price",
-        "Burden Multiplier",
-        "Alloc Cost -> Scanio",
-        "Alloc Cost -> Sea and Air",
-        "Alloc Cost -> Flat Price",
-    ]
-    with path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(header)
-        for row in rows:
-            writer.writerow(
-                [
-                    row["name"],
-                    HOME_COMPANY_LABEL[row["home_company"]],
-                    format_decimal(row["rate"]),
-                    format_decimal(row["scanio_hours"]),
-                    format_decimal(row["sea_and_air_hours"]),
-                    format_decimal(row["flat_price_hours"]),
-                    format_decimal(row["total_hours"]),
-                    format_decimal(row["regular_hours"]),
-                    format_decimal(row["overtime_hours"]),
-                    format_decimal(row["base_pay"]),
-                    format_decimal(row["overtime_premium"]),
-                    format_decimal(row["total_pay"]),
-                    format_decimal(row["scanio_pct"]),
-                    format_decimal(row["sea_and_air_pct"]),
-                    format_decimal(row["flat_price_pct"]),
-                    format_decimal(row["alloc_pay_scanio"]),
-                    format_decimal(row["alloc_pay_sea_and_air"]),
-                    format_decimal(row["alloc_pay_flat_price"]),
-                    format_decimal(row["burden_multiplier"]),
-                    format_decimal(row["alloc_cost_scanio"]),
-                    format_decimal(row["alloc_cost_sea_and_air"]),
-                    format_decimal(row["alloc_cost_flat_price"]),
-                ]
+def write_details_csv(path: Path, rows: list[CalcRow]) -> None:
+    # Every column except the name is a fixed label or a formatted number, so rows are joined
+    # directly and written in one call; the name gets csv.writer's minimal quoting.
+    lines = [DETAILS_HEADER_LINE]
+    for row in rows:
+        lines.append(
+            ",".join(
+                (
+                    csv_text_field(row.name),
+                    HOME_COMPANY_LABEL[row.home_company],
+                    format_decimal(row.rate),
+                    format_decimal(row.scanio_hours),
+                    format_decimal(row.sea_and_air_hours),
+                    format_decimal(row.flat_price_hours),
+                    format_decimal(row.total_hours),
+                    format_decimal(row.regular_hours),
+                    format_decimal(row.overtime_hours),
+                    format_decimal(row.base_pay),
+                    format_decimal(row.overtime_premium),
+                    format_decimal(row.total_pay),
+                    format_decimal(row.scanio_pct),
+                    format_decimal(row.sea_and_air_pct),
+                    format_decimal(row.flat_price_pct),
+                    format_decimal(row.alloc_pay_scanio),
+                    format_decimal(row.alloc_pay_sea_and_air),
+                    format_decimal(row.alloc_pay_flat_price),
+                    format_decimal(row.burden_multiplier),
+                    format_decimal(row.alloc_cost_scanio),
+                    format_decimal(row.alloc_cost_sea_and_air),
+                    format_decimal(row.alloc_cost_flat_price),
+                )
             )
+        )
+    lines.append("")
+    path.write_text("\r\n".join(lines), encoding="utf-8", newline="")
 
 
-def write_summary_csv(path: Path, rows: list[dict[str, Any]]) -> None:
-    totals_by_home: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
-    alloc_cost_by_home_to_billed: dict[str, dict[str, float]] = defaultdict(
-        lambda: defaultdict(float)
-    )
-    employees_by_home: dict[str, int] = defaultdict(int)
+def write_summary_csv(path: Path, rows: list[CalcRow]) -> None:
+    totals_by_home: dict[str, dict[str, float]] = {
+        home: {"total_hours": 0.0, "total_pay": 0.0} for home in HOME_COMPANIES
+    }
+    alloc_cost_by_home_to_billed: dict[str, dict[str, float]] = {
+        home: dict.fromkeys(BILLED_COMPANIES, 0.0) for home in HOME_COMPANIES
+    }
+    employees_by_home: dict[str, int] = dict.fromkeys(HOME_COMPANIES, 0)
 
     for row in rows:
-        home = row["home_company"]
+        home = row.home_company
         employees_by_home[home] += 1
-        totals_by_home[home]["total_hours"] += row["total_hours"]
-        totals_by_home[home]["total_pay"] += row["total_pay"]
-        alloc_cost_by_home_to_billed[home]["scanio"] += row["alloc_cost_scanio"]
-        alloc_cost_by_home_to_billed[home]["sea_and_air"] += row["alloc_cost_sea_and_air"]
-        alloc_cost_by_home_to_billed[home]["flat_price"] += row["alloc_cost_flat_price"]
+        totals = totals_by_home[home]
+        totals["total_hours"] += row.total_hours
+        totals["total_pay"] += row.total_pay
+        alloc_cost = alloc_cost_by_home_to_billed[home]
+        alloc_cost["scanio"] += row.alloc_cost_scanio
+        alloc_cost["sea_and_air"] += row.alloc_cost_sea_and_air
+        alloc_cost["flat_price"] += row.alloc_cost_flat_price
 
     scanio_to_sea = (
         alloc_cost_by_home_to_billed["sea_and_air_intl"]["scanio"]